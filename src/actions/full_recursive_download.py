@@ -333,9 +333,10 @@ def _handle_pagination(driver, job_id, initial_url, initial_domain, max_depth, v
             # If an error occurs, stop processing further paginated pages to avoid infinite loops on broken links
             break
 
-def execute(job_id, params, download_dir, write_result_to_outbound):
+def execute(job_id, params, download_dir, write_result_to_outbound, driver=None):
     """
     Uses a headless browser to recursively navigate to a URL and extract all visible text.
+    If a `driver` is passed in, it is used as-is and left open for the caller to quit.
     """
     initial_url = params.get('url')
     if not initial_url:
@@ -351,7 +352,7 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
     job_download_dir = os.path.join(download_dir, job_id)
     os.makedirs(job_download_dir, exist_ok=True)
 
-    driver = None
+    owns_driver = driver is None
     service = None
     crawled_data = []
     visited_urls = set()
@@ -360,7 +361,8 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
     initial_domain = urlparse(initial_url).netloc
 
     try:
-        driver, service = _setup_driver(job_download_dir)
+        if owns_driver:
+            driver, service = _setup_driver(job_download_dir)
         driver.get(initial_url)
         _handle_login(driver, params)
 
@@ -437,16 +439,16 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
         result = {'job_id': job_id, 'status': 'failed', 'error': str(e)}
 
     finally:
-        if driver:
+        if driver and owns_driver:
             driver.quit()
-        if service:
-            service.stop()
-        time.sleep(1)
-        if driver and hasattr(driver, 'temp_dir'):
-            try:
-                shutil.rmtree(driver.temp_dir)
-            except OSError as e:
-                logging.warning(f"Could not remove temporary directory {driver.temp_dir}: {e}")
+            if service:
+                service.stop()
+            time.sleep(1)
+            if hasattr(driver, 'temp_dir'):
+                try:
+                    shutil.rmtree(driver.temp_dir)
+                except OSError as e:
+                    logging.warning(f"Could not remove temporary directory {driver.temp_dir}: {e}")
 
     write_result_to_outbound(job_id, result)
 
@@ -1,7 +1,8 @@
 import os
-import json
 import logging
+import orjson
 from flask import current_app
+from src.queue_config import FAILED_MARKER_SUFFIX
 
 def execute(job_id, params, download_dir, write_result_to_outbound):
     """
@@ -17,6 +18,10 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
         if os.path.exists(queue_path):
             # Sort to ensure consistent order for testing
             for filename in sorted(os.listdir(queue_path)):
+                # Failure markers are empty bookkeeping files, not messages.
+                if filename.endswith(FAILED_MARKER_SUFFIX):
+                    continue
+
                 # Skip the file if it's the one currently being processed
                 if queue == 'inbound' and job_id in filename:
                     logging.info(f"Skipping current job's own message file: {filename}")
@@ -24,9 +29,10 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
 
                 filepath = os.path.join(queue_path, filename)
                 try:
-                    with open(filepath, 'r') as f:
-                        all_messages[queue].append(json.load(f))
-                except (IOError, json.JSONDecodeError) as e:
+                    # Parsed the way the server parses queue files: one binary read, then orjson.
+                    with open(filepath, 'rb') as f:
+                        all_messages[queue].append(orjson.loads(f.read()))
+                except (IOError, orjson.JSONDecodeError) as e:
                     logging.warning(f"Could not read or parse message {filename} in {queue}: {e}")
 
     result = {
@@ -146,11 +146,12 @@ def _parse_single_patent(patent_element):
     return patent_data
 
 
-def execute(job_id, params, download_dir, write_result_to_outbound, quit_driver=True):
+def execute(job_id, params, download_dir, write_result_to_outbound, quit_driver=True, driver=None):
     """
     Performs a Espacenet patent search based on the provided queries,
     scrapes the results, and returns them in the outbound JSON message.
     If `quit_driver` is False, the WebDriver instance is not closed and is returned by the function.
+    If a `driver` is passed in, it is reused (keeping its Espacenet session) and left open for the caller to quit.
     """
     logging.info(f"Executing search_espacenet for job {job_id} with params: {json.dumps(params, indent=2)}")
     queries = params.get('queries', [])
@@ -160,13 +161,14 @@ def execute(job_id, params, download_dir, write_result_to_outbound, quit_driver=
     max_patents = params.get('max_number_of_patents', DEFAULT_MAX_NUMBER_OF_PATENTS)
     job_download_dir = os.path.join(download_dir, job_id)
     os.makedirs(job_download_dir, exist_ok=True)
-    driver = None
+    owns_driver = driver is None
     original_home = os.environ.get('HOME')
     all_patents = {}
 
     try:
         # --- Stage 1: Main search to collect patent metadata ---
-        driver = _setup_driver(job_download_dir)
+        if owns_driver:
+            driver = _setup_driver(job_download_dir)
 
         logging.info(f"Navigating to Espacenet URL: {ESPACENET_BASE_URL}")
         try:
@@ -234,7 +236,7 @@ def execute(job_id, params, download_dir, write_result_to_outbound, quit_driver=
         logging.error(f"An error occurred during Espacenet search for job {job_id}: {e}", exc_info=True)
         result = {'job_id': job_id, 'status': 'failed', 'error': str(e)}
     finally:
-        if driver and quit_driver:
+        if driver and owns_driver and quit_driver:
             temp_dir_to_clean = driver.temp_dir if hasattr(driver, 'temp_dir') else None
             driver.quit()
             time.sleep(1)
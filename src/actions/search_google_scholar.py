@@ -348,10 +348,11 @@ def _get_total_estimated_results(driver):
     return 0
 
 
-def execute(job_id, params, download_dir, write_result_to_outbound):
+def execute(job_id, params, download_dir, write_result_to_outbound, driver=None):
     """
     Performs an advanced Google Scholar search based on the provided parameters,
     scrapes the results, and returns them in the outbound JSON message.
+    If a `driver` is passed in, it is used as-is and left open for the caller to quit.
     """
     logging.info(f"Executing search_google_scholar for job {job_id} with params: {json.dumps(params, indent=2)}")
 
@@ -367,7 +368,7 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
     job_download_dir = os.path.join(download_dir, job_id)
     os.makedirs(job_download_dir, exist_ok=True)
 
-    driver = None
+    owns_driver = driver is None
     all_results = []
     start_index = 0 # Initialize start index for pagination
     total_estimated_results = float('inf') # Initialize with a very large number
@@ -375,7 +376,8 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
     author_profile_cache = {} # Cache for author profile details
 
     try:
-        driver = _setup_driver(job_download_dir)
+        if owns_driver:
+            driver = _setup_driver(job_download_dir)
         
         while len(all_results) < max_articles and start_index < total_estimated_results:
             
@@ -459,7 +461,7 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
         result = {'job_id': job_id, 'status': 'failed', 'error': str(e)}
 
     finally:
-        if driver:
+        if driver and owns_driver:
             driver.quit()
             time.sleep(1) # Give time for processes to release file handles
             if hasattr(driver, 'temp_dir'):
@@ -277,10 +277,11 @@ def _extract_matched_authors(driver):
     return authors
 
 
-def execute(job_id, params, download_dir, write_result_to_outbound):
+def execute(job_id, params, download_dir, write_result_to_outbound, driver=None):
     """
     Performs a Semantic Scholar search based on the provided parameters,
     scrapes the results, and returns them in the outbound JSON message.
+    If a `driver` is passed in, it is used as-is and left open for the caller to quit.
     """
     logging.info(f"Executing search_semantic_scholar for job {job_id} with params: {json.dumps(params, indent=2)}")
     query_params = params.get('query', {})
@@ -291,7 +292,7 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
     relevant_author_query = query_params.get('author') if fetch_author_details == 'relevant' else None
     job_download_dir = os.path.join(download_dir, job_id)
     os.makedirs(job_download_dir, exist_ok=True)
-    driver = None
+    owns_driver = driver is None
     all_results = []
     matched_authors = []
     page = 1
@@ -300,7 +301,8 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
     estimated_citations = 0
     author_profile_cache = {}
     try:
-        driver = _setup_driver(job_download_dir, download_dir)
+        if owns_driver:
+            driver = _setup_driver(job_download_dir, download_dir)
 
         search_url = _build_semantic_scholar_url(query_params)
         logging.info(f"Navigating to Semantic Scholar URL: {search_url}")
@@ -391,7 +393,7 @@ def execute(job_id, params, download_dir, write_result_to_outbound):
         logging.error(f"An error occurred during Semantic Scholar search for job {job_id}: {e}", exc_info=True)
         result = {'job_id': job_id, 'status': 'failed', 'error': str(e)}
     finally:
-        if driver:
+        if driver and owns_driver:
             driver.quit()
             time.sleep(1)
             if hasattr(driver, 'temp_dir'):
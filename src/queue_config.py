@@ -0,0 +1,5 @@
+# Queue conventions shared by the server and the actions. Kept free of Flask and Selenium
+# so actions can import it without loading the web layer.
+
+# Suffix of the empty marker file left in the failed queue for each failed job.
+FAILED_MARKER_SUFFIX = '.marker'
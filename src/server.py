@@ -7,24 +7,63 @@ import shutil
 import atexit
 import importlib
 import logging
+import re
 import signal
 import threading
-from flask import Flask, request, jsonify, render_template, current_app
+import concurrent.futures
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import orjson
+from flask import Flask, Response, request, jsonify, render_template, current_app
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.executors.pool import ThreadPoolExecutor
 
+# inotify is Linux-only; without it the inbound queue falls back to interval polling.
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
+
 # --- Path Setup ---
 SRC_ROOT = os.path.abspath(os.path.dirname(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(SRC_ROOT, '..'))
 sys.path.insert(0, PROJECT_ROOT)
 
+from src.queue_config import FAILED_MARKER_SUFFIX
+
 # --- Constants ---
 MAX_IDLE_TIME_IN_SECONDS = 1800
+QUEUE_POLL_INTERVAL_SECONDS = 5
+QUEUE_SAFETY_NET_INTERVAL_SECONDS = 60
 QUEUE_PEREMPTION_DAYS = 7
+QUEUE_NAMES = ['inbound', 'outbound', 'consumed', 'failed', 'processing']
+ACTION_NAME_PATTERN = re.compile(r'[a-z_][a-z0-9_]*')
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Actions each gunicorn worker runs at once, as its 5 scheduler threads did before the action pool.
+DEFAULT_ACTION_POOL_WORKERS = 5
+# Config values handed to action pool workers; the rest of app.config is not picklable or not needed.
+ACTION_WORKER_CONFIG_KEYS = ('BASE_QUEUE_PATH', 'DOWNLOAD_DIR', 'ACTIONS_DIR', 'INBOUND_DIR',
+                             'OUTBOUND_DIR', 'CONSUMED_DIR', 'FAILED_DIR', 'PROCESSING_DIR')
+
+# --- Static Responses ---
+# Bodies of the fixed responses returned on the polling hot path, serialized once at import.
+_PENDING_RESPONSE_BODY = orjson.dumps({'status': 'Pending', 'message': 'Job not yet completed.'})
+_FAILED_RESPONSE_BODY = orjson.dumps({'status': 'failed', 'message': 'Job failed during processing.'})
+_MISSING_JOB_ID_RESPONSE_BODY = orjson.dumps({'status': 'error', 'message': 'Job ID is required'})
+_INVALID_REQUEST_RESPONSE_BODY = orjson.dumps({'status': 'error', 'message': 'Invalid request'})
+
+# --- Action Cache ---
+# Maps action names to their resolved 'execute' callables so each module is imported only once.
+_ACTION_CACHE = {}
 
 # --- Global Shutdown Signal ---
 shutdown_event = threading.Event()
 
+# --- Action Pool ---
+# Serializes replacing a broken action pool, whose pending tasks all fail at once.
+_ACTION_POOL_LOCK = threading.Lock()
+
 def create_app(testing=False):
     """Application factory for the Flask app."""
     app = Flask(__name__,
@@ -33,7 +72,7 @@ def create_app(testing=False):
 
     # --- Logging Configuration ---
     log_level = logging.ERROR if testing else logging.INFO
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+    logging.basicConfig(level=log_level, format=LOG_FORMAT, force=True)
 
     # --- App Configuration ---
     APP_ENV = os.environ.get('APP_ENV', 'development')
@@ -44,10 +83,10 @@ def create_app(testing=False):
     else:
         base_path = os.path.join(PROJECT_ROOT, 'dev_queues')
 
-    app.config['BASE_QUEUE_PATH'] = base_path
     app.config['DOWNLOAD_DIR'] = os.path.join(PROJECT_ROOT, 'downloads')
     app.config['ACTIONS_DIR'] = os.path.join(SRC_ROOT, 'actions') # Correctly point to src/actions
     app.config['TESTING'] = testing
+    configure_queue_paths(app, base_path)
 
     # --- Initialization ---
     with app.app_context():
@@ -56,46 +95,68 @@ def create_app(testing=False):
         
         os.makedirs(current_app.config['BASE_QUEUE_PATH'], exist_ok=True)
         os.makedirs(current_app.config['DOWNLOAD_DIR'], exist_ok=True)
-        for dir_name in ['inbound', 'outbound', 'consumed', 'failed', 'processing']:
-            os.makedirs(os.path.join(current_app.config['BASE_QUEUE_PATH'], dir_name), exist_ok=True)
+        for queue_name in QUEUE_NAMES:
+            os.makedirs(current_app.config[f'{queue_name.upper()}_DIR'], exist_ok=True)
+
+        # Tasks move between queues with plain renames, which only work within one filesystem.
+        base_device = os.stat(current_app.config['BASE_QUEUE_PATH']).st_dev
+        for queue_name in QUEUE_NAMES:
+            queue_dir = current_app.config[f'{queue_name.upper()}_DIR']
+            if os.stat(queue_dir).st_dev != base_device:
+                raise RuntimeError(f"Queue directory '{queue_dir}' must be on the same filesystem as the queue base path.")
         
         os.makedirs(app.config['ACTIONS_DIR'], exist_ok=True)
         
-        timestamp_file = os.path.join(current_app.config['BASE_QUEUE_PATH'], 'last_api_call.timestamp')
-        with open(timestamp_file, 'w') as f:
-            f.write(str(time.time()))
+        # The last API call time is kept in memory per worker and flushed to the shared timestamp file by the scheduler.
+        app.config['LAST_API_CALL'] = time.time()
+        flush_last_api_call(app)
 
     # --- Scheduler & Startup Jobs ---
     if not testing:
         logging.info("Running purge job on startup...")
         purge_old_files(app)
 
+        # Actions run in separate processes, so a scraper that crashes cannot take the web worker down.
+        # They mostly wait on Chrome and the network, so the pool is sized by concurrency, not by CPU count.
+        app.config['ACTION_POOL_WORKERS'] = int(os.environ.get('ACTION_POOL_WORKERS', DEFAULT_ACTION_POOL_WORKERS))
+        app.config['ACTION_POOL'] = _create_action_pool(app.config['ACTION_POOL_WORKERS'])
+        atexit.register(lambda: app.config['ACTION_POOL'].shutdown(wait=False))
+
         executors = {'default': ThreadPoolExecutor(5)}
         job_defaults = {'coalesce': False, 'max_instances': 5}
         scheduler = BackgroundScheduler(executors=executors, job_defaults=job_defaults)
         
+        # With inotify, new tasks are dispatched as they land and the interval job is only a safety net.
+        queue_interval = QUEUE_SAFETY_NET_INTERVAL_SECONDS if INotify else QUEUE_POLL_INTERVAL_SECONDS
+
         # Pass the scheduler instance to the jobs that need it
-        scheduler.add_job(func=process_inbound_queue, args=[app, shutdown_event], trigger='interval', seconds=5, id='process_queue')
+        scheduler.add_job(func=process_inbound_queue, args=[app, shutdown_event], trigger='interval', seconds=queue_interval, id='process_queue')
         scheduler.add_job(func=check_idle_shutdown, args=[app, scheduler, shutdown_event], trigger='interval', seconds=30, id='idle_check')
+        scheduler.add_job(func=flush_last_api_call, args=[app], trigger='interval', seconds=60, id='flush_last_api_call')
         scheduler.add_job(func=lambda: purge_old_files(app, shutdown_event=shutdown_event), trigger='cron', hour=3, id='purge_old_files_daily')
         
         atexit.register(lambda: scheduler.shutdown(wait=False))
         scheduler.start()
         logging.info("Scheduler started with recurring jobs enabled.")
 
+        if INotify:
+            watcher = threading.Thread(target=watch_inbound_queue, args=[app, scheduler, shutdown_event], daemon=True)
+            watcher.start()
+            logging.info("Watching the inbound queue for new tasks with inotify.")
+
     # --- Register Routes ---
+    @app.before_request
+    def record_api_call():
+        # Only inbound and outbound calls count as activity for the idle check, not /queues or /purge.
+        if request.endpoint in ('inbound_route', 'outbound_route'):
+            current_app.config['LAST_API_CALL'] = time.time()
+
     @app.route('/inbound', methods=['POST'])
     def inbound_route():
-        timestamp_file = os.path.join(current_app.config['BASE_QUEUE_PATH'], 'last_api_call.timestamp')
-        with open(timestamp_file, 'w') as f:
-            f.write(str(time.time()))
         return receive_task()
 
     @app.route('/outbound', methods=['GET'])
     def outbound_route():
-        timestamp_file = os.path.join(current_app.config['BASE_QUEUE_PATH'], 'last_api_call.timestamp')
-        with open(timestamp_file, 'w') as f:
-            f.write(str(time.time()))
         return check_task_status()
 
     @app.route('/queues', methods=['GET'])
@@ -119,48 +180,69 @@ def create_app(testing=False):
 
     return app
 
+def configure_queue_paths(app, base_path):
+    """
+    Points the app at a queue base path. The queue directories are fixed for as long as
+    the base path is, so they are joined once here rather than on every request.
+    """
+    app.config['BASE_QUEUE_PATH'] = base_path
+    app.config['INBOUND_DIR'] = os.path.join(base_path, 'inbound')
+    app.config['OUTBOUND_DIR'] = os.path.join(base_path, 'outbound')
+    app.config['CONSUMED_DIR'] = os.path.join(base_path, 'consumed')
+    app.config['FAILED_DIR'] = os.path.join(base_path, 'failed')
+    app.config['PROCESSING_DIR'] = os.path.join(base_path, 'processing')
+    app.config['TIMESTAMP_FILE'] = os.path.join(base_path, 'last_api_call.timestamp')
+    app.config['PURGE_DIRS'] = (
+        app.config['INBOUND_DIR'],
+        app.config['OUTBOUND_DIR'],
+        app.config['CONSUMED_DIR'],
+        app.config['FAILED_DIR'],
+        app.config['PROCESSING_DIR'],
+        app.config['DOWNLOAD_DIR'],
+    )
+
 def get_messages_status():
     """Returns the content of each message queue."""
-    base_path = current_app.config['BASE_QUEUE_PATH']
-    queues = ['inbound', 'outbound', 'consumed', 'failed', 'processing']
     queues_content = {}
 
-    for queue_name in queues:
-        queue_dir = os.path.join(base_path, queue_name)
+    for queue_name in QUEUE_NAMES:
+        queue_dir = current_app.config[f'{queue_name.upper()}_DIR']
         queues_content[queue_name] = []
-        if os.path.exists(queue_dir):
-            for filename in os.listdir(queue_dir):
-                filepath = os.path.join(queue_dir, filename)
-                try:
-                    with open(filepath, 'r') as f:
-                        queues_content[queue_name].append(json.load(f))
-                except (IOError, json.JSONDecodeError) as e:
-                    logging.error(f"Error reading file {filepath}: {e}")
+        try:
+            filenames = os.listdir(queue_dir)
+        except FileNotFoundError:
+            continue
+        for filename in filenames:
+            if filename.endswith(FAILED_MARKER_SUFFIX):
+                continue
+            filepath = os.path.join(queue_dir, filename)
+            try:
+                queues_content[queue_name].append(_load_json(filepath))
+            except (IOError, json.JSONDecodeError) as e:
+                logging.error(f"Error reading file {filepath}: {e}")
     return jsonify(queues_content)
 
 def receive_task():
     """Handles creating a new task from an inbound request."""
     data = request.get_json()
     if not data or 'action' not in data:
-        return jsonify({'status': 'error', 'message': 'Invalid request'}), 400
+        return Response(_INVALID_REQUEST_RESPONSE_BODY, status=400, mimetype='application/json')
 
-    job_id = str(uuid.uuid4())
+    job_id = uuid.uuid4().hex
+    # Read the clock once for both the task timestamp and the sortable filename prefix.
+    received_ns = time.time_ns()
     task = {
         'job_id': job_id,
         'action': data['action'],
         'params': data.get('params', {}),
         'status': 'Pending',
-        'received_at': time.time()
+        'received_at': received_ns / 1e9
     }
 
-    inbound_queue_dir = os.path.join(current_app.config['BASE_QUEUE_PATH'], 'inbound')
-    filename = f"{int(time.time() * 1000)}_{job_id}.json"
-    filepath = os.path.join(inbound_queue_dir, filename)
+    filepath = os.path.join(current_app.config['INBOUND_DIR'], f"{received_ns // 1_000_000}_{job_id}.json")
 
     try:
-        os.makedirs(inbound_queue_dir, exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(task, f, indent=4)
+        _dump_json(filepath, task)
         return jsonify({'status': 'received', 'job_id': job_id})
     except IOError as e:
         logging.error(f"Error writing to inbound queue: {e}")
@@ -170,33 +252,61 @@ def check_task_status():
     """Handles checking the status of a task."""
     job_id = request.args.get('job_id')
     if not job_id:
-        return jsonify({'status': 'error', 'message': 'Job ID is required'}), 400
+        return Response(_MISSING_JOB_ID_RESPONSE_BODY, status=400, mimetype='application/json')
 
-    base_path = current_app.config['BASE_QUEUE_PATH']
-    outbound_queue_dir = os.path.join(base_path, 'outbound')
-    consumed_dir = os.path.join(base_path, 'consumed')
+    outbound_queue_dir = current_app.config['OUTBOUND_DIR']
+    consumed_dir = current_app.config['CONSUMED_DIR']
     result_filepath = os.path.join(outbound_queue_dir, f"{job_id}.json")
 
     if os.path.exists(result_filepath):
         try:
-            with open(result_filepath, 'r') as f:
-                task_result = json.load(f)
-            os.makedirs(consumed_dir, exist_ok=True)
+            # The result file was written by this server as JSON, so it is sent back as-is
+            # instead of being parsed and re-serialized.
+            with open(result_filepath, 'rb') as f:
+                task_result = f.read()
             # Use the original task filename for consistency in consumed folder
             consumed_filename = f"result_{job_id}.json"
-            shutil.move(result_filepath, os.path.join(consumed_dir, consumed_filename))
-            return jsonify(task_result)
-        except (IOError, json.JSONDecodeError) as e:
+            consumed_filepath = os.path.join(consumed_dir, consumed_filename)
+            os.replace(result_filepath, consumed_filepath)
+            _drop_from_page_cache(consumed_filepath)
+            return Response(task_result, mimetype='application/json')
+        except IOError as e:
             logging.error(f"Error reading or moving result file: {e}")
             return jsonify({'status': 'error', 'message': 'Could not retrieve result'}), 500
     else:
         # Check if the job failed and is in the failed queue
-        failed_dir = os.path.join(base_path, 'failed')
-        for f in os.listdir(failed_dir):
-            if job_id in f:
-                return jsonify({'status': 'failed', 'message': 'Job failed during processing.'})
-        return jsonify({'status': 'Pending', 'message': 'Job not yet completed.'})
+        failed_dir = current_app.config['FAILED_DIR']
+        if os.path.exists(os.path.join(failed_dir, f"{job_id}{FAILED_MARKER_SUFFIX}")):
+            return Response(_FAILED_RESPONSE_BODY, mimetype='application/json')
+        return Response(_PENDING_RESPONSE_BODY, mimetype='application/json')
+
+
+def _dump_json(path, obj):
+    """Serializes an object with orjson and writes it to a file in a single write."""
+    data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+def _drop_from_page_cache(path):
+    """
+    Advises the kernel to evict an archived queue file from the page cache.
+    Consumed and failed files are kept for retention only and are not read again.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logging.debug(f"Could not drop {path} from the page cache: {e}")
 
+def _load_json(path):
+    """Reads a JSON file in one read and parses it with orjson."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def page_not_found(e):
     """Renders the custom 404 HTML page."""
@@ -204,12 +314,10 @@ def page_not_found(e):
 
 def write_result_to_outbound(job_id, result_data):
     """Saves a task's result to a JSON file within an app context."""
-    outbound_queue_dir = os.path.join(current_app.config['BASE_QUEUE_PATH'], 'outbound')
+    outbound_queue_dir = current_app.config['OUTBOUND_DIR']
     filepath = os.path.join(outbound_queue_dir, f"{job_id}.json")
     try:
-        os.makedirs(outbound_queue_dir, exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(result_data, f, indent=4)
+        _dump_json(filepath, result_data)
     except IOError as e:
         logging.error(f"Error writing result for job {job_id}: {e}")
 
@@ -219,34 +327,74 @@ def process_inbound_queue(app, stop_event):
         logging.info("Shutdown initiated, skipping queue processing.")
         return
     with app.app_context():
-        base_path = current_app.config['BASE_QUEUE_PATH']
-        inbound_queue_dir = os.path.join(base_path, 'inbound')
+        inbound_queue_dir = current_app.config['INBOUND_DIR']
         
-        if not os.path.exists(inbound_queue_dir) or not os.listdir(inbound_queue_dir):
+        try:
+            with os.scandir(inbound_queue_dir) as entries:
+                task_entries = sorted(entries, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return
+
+        if not task_entries:
             return
 
         logging.info("Scheduler worker checking for tasks...")
         
         # Process all files in the directory, not just the first one
-        for task_filename in sorted(os.listdir(inbound_queue_dir)):
-            process_single_task(task_filename, app)
+        for task_entry in task_entries:
+            process_single_task(task_entry.name, app)
+
+def watch_inbound_queue(app, scheduler, stop_event):
+    """
+    Blocks on inotify events for the inbound queue and hands each new task file
+    to the scheduler's thread pool as soon as it has been written or moved in.
+    """
+    inotify = INotify()
+    inotify.add_watch(app.config['INBOUND_DIR'], inotify_flags.MOVED_TO | inotify_flags.CLOSE_WRITE)
+    try:
+        while not stop_event.is_set():
+            # The timeout lets the loop notice the shutdown signal on an idle queue.
+            for event in inotify.read(timeout=1000):
+                if stop_event.is_set():
+                    break
+                scheduler.add_job(func=process_single_task, args=[event.name, app])
+    except Exception as e:
+        logging.error(f"Inbound queue watcher stopped: {e}", exc_info=True)
+    finally:
+        inotify.close()
+
+def _get_action(action_name):
+    """Returns the 'execute' callable of an action, importing it from 'src.actions' on first use."""
+    execute_action = _ACTION_CACHE.get(action_name)
+    if execute_action is not None:
+        return execute_action
+
+    # Only plain module names are accepted, so a task cannot import outside 'src.actions'.
+    if not ACTION_NAME_PATTERN.fullmatch(action_name):
+        raise ValueError(f"Invalid action name '{action_name}'.")
+
+    # Dynamically import from 'src.actions'
+    try:
+        logging.info(f"Attempting to import action module: src.actions.{action_name}")
+        action_module = importlib.import_module(f"src.actions.{action_name}")
+    except ModuleNotFoundError:
+        raise ValueError(f"Action '{action_name}' not found in 'src/actions'.")
+
+    execute_action = action_module.execute
+    _ACTION_CACHE[action_name] = execute_action
+    return execute_action
 
 def process_single_task(task_filename, app):
-    """Processes a single task file from the inbound queue."""
+    """
+    Claims a single task file from the inbound queue and runs it, in the
+    action process pool when one is configured, otherwise in the calling thread.
+    """
     with app.app_context():
-        base_path = current_app.config['BASE_QUEUE_PATH']
-        inbound_queue_dir = os.path.join(base_path, 'inbound')
-        processing_dir = os.path.join(base_path, 'processing')
-        consumed_dir = os.path.join(base_path, 'consumed')
-        failed_dir = os.path.join(base_path, 'failed')
-        download_dir = current_app.config['DOWNLOAD_DIR']
-        actions_dir_path = current_app.config['ACTIONS_DIR']
-        
-        task_filepath = os.path.join(inbound_queue_dir, task_filename)
-        processing_filepath = os.path.join(processing_dir, task_filename)
+        task_filepath = os.path.join(current_app.config['INBOUND_DIR'], task_filename)
+        processing_filepath = os.path.join(current_app.config['PROCESSING_DIR'], task_filename)
 
         try:
-            shutil.move(task_filepath, processing_filepath)
+            os.rename(task_filepath, processing_filepath)
         except FileNotFoundError:
             logging.info(f"Task {task_filename} already claimed. Skipping.")
             return
@@ -255,12 +403,87 @@ def process_single_task(task_filename, app):
             return
 
         logging.info(f"Worker claimed task: {task_filename}")
+        action_pool = current_app.config.get('ACTION_POOL')
+
+    if action_pool is None:
+        _run_claimed_task(task_filename, app)
+        return
+
+    worker_config = {key: app.config[key] for key in ACTION_WORKER_CONFIG_KEYS}
+    try:
+        future = action_pool.submit(_run_action, task_filename, worker_config)
+    except RuntimeError as e:
+        # The pool is broken, or was shut down by another thread replacing it.
+        _handle_action_pool_failure(task_filename, app, action_pool, e)
+        return
+    future.add_done_callback(lambda f: _check_action_pool_result(task_filename, app, action_pool, f))
+
+def _create_action_pool(max_workers):
+    """Creates the process pool actions run in, running at most `max_workers` actions at once."""
+    # Workers are spawned rather than forked because the parent already runs threads.
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_action_worker)
+
+def _init_action_worker():
+    """Configures logging in a freshly spawned action pool worker."""
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, force=True)
+
+def _run_action(task_filename, worker_config):
+    """
+    Action pool entry point. Rebuilds a minimal app around the queue configuration
+    so actions and write_result_to_outbound can use current_app as usual.
+    """
+    worker_app = Flask(__name__)
+    worker_app.config.update(worker_config)
+    _run_claimed_task(task_filename, worker_app)
+
+def _check_action_pool_result(task_filename, app, action_pool, future):
+    """
+    Done-callback of a submitted task. Failures of the task itself are already handled in the
+    worker, so an exception here means the pool failed, e.g. a worker process died mid-task.
+    """
+    error = future.exception() if not future.cancelled() else RuntimeError("Task was cancelled.")
+    if error is not None:
+        _handle_action_pool_failure(task_filename, app, action_pool, error)
+
+def _handle_action_pool_failure(task_filename, app, action_pool, error):
+    """
+    Fails a task the action pool could not run, so it does not stay in the processing
+    queue forever, and replaces the pool if it is broken.
+    """
+    logging.error(f"Action pool failed to run task {task_filename}: {error}")
+    with app.app_context():
+        processing_filepath = os.path.join(current_app.config['PROCESSING_DIR'], task_filename)
+        if os.path.exists(processing_filepath):
+            try:
+                task_to_process = _load_json(processing_filepath)
+            except Exception:
+                task_to_process = None
+            _fail_claimed_task(task_filename, task_to_process, error)
+
+    if isinstance(error, BrokenProcessPool):
+        with _ACTION_POOL_LOCK:
+            if app.config.get('ACTION_POOL') is action_pool:
+                logging.warning("Action pool is broken. Replacing it with a new one.")
+                app.config['ACTION_POOL'] = _create_action_pool(app.config['ACTION_POOL_WORKERS'])
+                action_pool.shutdown(wait=False)
+
+def _run_claimed_task(task_filename, app):
+    """Runs a task that has already been moved to the processing queue."""
+    with app.app_context():
+        base_path = current_app.config['BASE_QUEUE_PATH']
+        processing_dir = current_app.config['PROCESSING_DIR']
+        consumed_dir = current_app.config['CONSUMED_DIR']
+        download_dir = current_app.config['DOWNLOAD_DIR']
+        
+        processing_filepath = os.path.join(processing_dir, task_filename)
+
         task_to_process = None
         job_id = "unknown"
         try:
             logging.info(f"Starting processing of task file: {task_filename}")
-            with open(processing_filepath, 'r') as f:
-                task_to_process = json.load(f)
+            task_to_process = _load_json(processing_filepath)
 
             job_id = task_to_process.get('job_id', 'unknown')
             action_name = task_to_process.get('action')
@@ -274,37 +497,61 @@ def process_single_task(task_filename, app):
 
             logging.info(f"Processing job {job_id} for action '{action_name}'")
 
-            # Dynamically import from 'src.actions'
-            try:
-                logging.info(f"Attempting to import action module: src.actions.{action_name}")
-                action_module = importlib.import_module(f"src.actions.{action_name}")
-            except ModuleNotFoundError:
-                raise ValueError(f"Action '{action_name}' not found in 'src/actions'.")
+            execute_action = _get_action(action_name)
 
             # Pass the app context to the action
             logging.info(f"Executing action for job {job_id}")
-            action_module.execute(job_id, params, download_dir, write_result_to_outbound)
+            execute_action(job_id, params, download_dir, write_result_to_outbound)
             logging.info(f"Action execution completed for job {job_id}")
 
             consumed_filepath = os.path.join(consumed_dir, task_filename)
-            shutil.move(processing_filepath, consumed_filepath)
+            os.replace(processing_filepath, consumed_filepath)
+            _drop_from_page_cache(consumed_filepath)
 
         except Exception as e:
             error_message = f"An unexpected error occurred while processing task {task_filename}: {e}"
             logging.error(error_message, exc_info=True)
-            if task_to_process:
-                job_id = task_to_process.get('job_id', 'unknown')
-                # Preserve original task data and add error info
-                task_to_process['status'] = 'failed'
-                task_to_process['error'] = str(e)
-                result = task_to_process
-            else:
-                result = {'job_id': job_id, 'status': 'failed', 'error': str(e)}
-
-            write_result_to_outbound(job_id, result)
-            
-            if os.path.exists(processing_filepath):
-                shutil.move(processing_filepath, os.path.join(failed_dir, task_filename))
+            _fail_claimed_task(task_filename, task_to_process, e)
+
+def _fail_claimed_task(task_filename, task_to_process, error):
+    """
+    Writes the failure result of a claimed task and moves it from the processing
+    to the failed queue. Must be called within an app context.
+    """
+    processing_filepath = os.path.join(current_app.config['PROCESSING_DIR'], task_filename)
+    failed_dir = current_app.config['FAILED_DIR']
+
+    job_id = "unknown"
+    if task_to_process:
+        job_id = task_to_process.get('job_id', 'unknown')
+        # Preserve original task data and add error info
+        task_to_process['status'] = 'failed'
+        task_to_process['error'] = str(error)
+        result = task_to_process
+    else:
+        result = {'job_id': job_id, 'status': 'failed', 'error': str(error)}
+
+    write_result_to_outbound(job_id, result)
+    
+    if os.path.exists(processing_filepath):
+        failed_filepath = os.path.join(failed_dir, task_filename)
+        os.replace(processing_filepath, failed_filepath)
+        _drop_from_page_cache(failed_filepath)
+
+    # Leave a marker named after the job so status checks don't have to scan the failed queue.
+    if job_id != 'unknown':
+        try:
+            open(os.path.join(failed_dir, f"{job_id}{FAILED_MARKER_SUFFIX}"), 'wb').close()
+        except OSError as e:
+            logging.error(f"Could not write failure marker for job {job_id}: {e}")
+
+def _is_dir_empty(directory):
+    """Returns True if the directory has no entries or does not exist."""
+    try:
+        with os.scandir(directory) as entries:
+            return next(entries, None) is None
+    except FileNotFoundError:
+        return True
 
 def check_idle_shutdown(app, scheduler, stop_event):
     """
@@ -316,20 +563,21 @@ def check_idle_shutdown(app, scheduler, stop_event):
             # Already shutting down, no need to do anything.
             return
 
-        base_path = current_app.config['BASE_QUEUE_PATH']
-        inbound_queue_dir = os.path.join(base_path, 'inbound')
-        processing_dir = os.path.join(base_path, 'processing')
-        timestamp_file = os.path.join(base_path, 'last_api_call.timestamp')
+        inbound_queue_dir = current_app.config['INBOUND_DIR']
+        processing_dir = current_app.config['PROCESSING_DIR']
 
-        inbound_is_empty = not (os.path.exists(inbound_queue_dir) and os.listdir(inbound_queue_dir))
-        processing_is_empty = not (os.path.exists(processing_dir) and os.listdir(processing_dir))
+        inbound_is_empty = _is_dir_empty(inbound_queue_dir)
+        processing_is_empty = _is_dir_empty(processing_dir)
 
         if not inbound_is_empty or not processing_is_empty:
             return
 
         try:
-            with open(timestamp_file, 'r') as f:
-                last_api_call_time = float(f.read().strip())
+            # Each gunicorn worker only sees its own calls in memory; the file holds the latest flushed by any of them.
+            last_api_call_time = float(current_app.config['LAST_API_CALL'])
+            persisted_time = _read_last_api_call(current_app.config['TIMESTAMP_FILE'])
+            if persisted_time is not None:
+                last_api_call_time = max(last_api_call_time, persisted_time)
             
             idle_time = time.time() - last_api_call_time
             if idle_time > MAX_IDLE_TIME_IN_SECONDS:
@@ -348,9 +596,57 @@ def check_idle_shutdown(app, scheduler, stop_event):
                 logging.info("Scheduler stopped. Issuing power off command.")
                 os.system('sudo /sbin/shutdown --poweroff now')
 
-        except (FileNotFoundError, ValueError, IOError) as e:
+        except (KeyError, ValueError, TypeError) as e:
             logging.warning(f"Could not check idle time: {e}")
 
+def _read_last_api_call(timestamp_file):
+    """Returns the last API call time persisted by any worker, or None if there is none yet."""
+    try:
+        with open(timestamp_file, 'r') as f:
+            return float(f.read().strip())
+    except (FileNotFoundError, ValueError, IOError):
+        return None
+
+def flush_last_api_call(app):
+    """
+    Persists the in-memory last API call time to the timestamp file shared by all
+    workers, unless another worker has already recorded a more recent call.
+    """
+    with app.app_context():
+        timestamp_file = current_app.config['TIMESTAMP_FILE']
+        last_api_call_time = current_app.config['LAST_API_CALL']
+        persisted_time = _read_last_api_call(timestamp_file)
+        if persisted_time is not None and persisted_time >= last_api_call_time:
+            return
+        try:
+            # Write then rename so a concurrent reader never sees a partially written value.
+            temp_file = f"{timestamp_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'w') as f:
+                f.write(str(last_api_call_time))
+            os.replace(temp_file, timestamp_file)
+        except IOError as e:
+            logging.warning(f"Could not persist last API call time: {e}")
+
+def _purge_one_dir(directory, cutoff):
+    """Deletes the entries of a single directory whose modification time is older than the cutoff."""
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+
+    logging.info(f"Purging old files from: {directory}")
+    # DirEntry caches the file type from readdir, so only the mtime needs a stat call.
+    with entries:
+        for entry in entries:
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+            except Exception as e:
+                logging.error(f"Error purging {entry.path}: {e}", exc_info=True)
+
 def purge_old_files(app, retention_days=None, shutdown_event=None):
     """
     Deletes files and directories older than the specified number of days.
@@ -362,36 +658,15 @@ def purge_old_files(app, retention_days=None, shutdown_event=None):
     with app.app_context():
         days = retention_days if retention_days is not None else QUEUE_PEREMPTION_DAYS
         logging.info(f"Purge job started. Deleting items older than {days} days.")
-        base_path = current_app.config['BASE_QUEUE_PATH']
-        download_dir = current_app.config['DOWNLOAD_DIR']
-        
         cutoff = time.time() - (days * 24 * 60 * 60)
-        
-        dirs_to_purge = [
-            os.path.join(base_path, 'inbound'),
-            os.path.join(base_path, 'outbound'),
-            os.path.join(base_path, 'consumed'),
-            os.path.join(base_path, 'failed'),
-            os.path.join(base_path, 'processing'),
-            download_dir
-        ]
-
-        for directory in dirs_to_purge:
-            if not os.path.exists(directory):
-                continue
-            
-            logging.info(f"Purging old files from: {directory}")
-            for item_name in os.listdir(directory):
-                item_path = os.path.join(directory, item_name)
-                try:
-                    item_mod_time = os.path.getmtime(item_path)
-                    if item_mod_time < cutoff:
-                        if os.path.isdir(item_path):
-                            shutil.rmtree(item_path)
-                        else:
-                            os.remove(item_path)
-                except Exception as e:
-                    logging.error(f"Error purging {item_path}: {e}", exc_info=True)
+
+        # The directories are disjoint, so they can be walked concurrently.
+        purge_dirs = current_app.config['PURGE_DIRS']
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(purge_dirs)) as executor:
+            futures = [executor.submit(_purge_one_dir, directory, cutoff) for directory in purge_dirs]
+            for future in concurrent.futures.as_completed(futures):
+                # Surface errors from the worker threads just like the serial loop did.
+                future.result()
         
         logging.info("Purge job finished.")
 
@@ -0,0 +1,84 @@
+# tests/conftest.py
+import os
+import http.server
+import mimetypes
+import threading
+import pytest
+
+# Markers for tests that drive a real browser against live third-party websites.
+LIVE_MARKERS = ('functional', 'slow')
+
+# Resolved from this file so the fixtures are found whatever directory pytest is run from.
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live",
+        action="store_true",
+        default=False,
+        help="Run the functional tests that hit live websites (skipped by default).",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "functional: scrapes a live website with a real browser")
+    config.addinivalue_line("markers", "slow: long-running live scraping session")
+    # Also registered by pytest-xdist; declared here so --strict-markers passes without it
+    config.addinivalue_line("markers", "xdist_group(name): run all tests of the group on the same xdist worker")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skips the live-network tests unless `--live` was given on the command line."""
+    if config.getoption("--live"):
+        return
+    skip_live = pytest.mark.skip(reason="hits live websites; run with --live")
+    for item in items:
+        if any(item.get_closest_marker(marker) for marker in LIVE_MARKERS):
+            item.add_marker(skip_live)
+
+
+@pytest.fixture(scope="session")
+def static_file_server():  # Renamed from 'live_server' to avoid conflict with pytest-flask
+    """
+    Starts a simple HTTP server in a background thread to serve static files
+    from the 'tests/fixtures' directory. It is only started if a test asks for it,
+    and then once per session.
+    """
+    # The fixture pages are small, so they are read once and every request is answered from memory.
+    files = {}
+    with os.scandir(FIXTURES_DIR) as entries:
+        for entry in entries:
+            if entry.is_file():
+                with open(entry.path, 'rb') as f:
+                    content_type = mimetypes.guess_type(entry.name)[0] or 'application/octet-stream'
+                    files[f'/{entry.name}'] = (f.read(), content_type)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            fixture = files.get(self.path.split('?', 1)[0])
+            if fixture is None:
+                self.send_error(404)
+                return
+            body, content_type = fixture
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    # Binding to port 0 lets the OS pick a free port for the server's own socket, so there
+    # is no window in which another process (or xdist worker) can take it first.
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    port = httpd.server_address[1]
+
+    server_thread = threading.Thread(target=httpd.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    yield f"http://127.0.0.1:{port}"
+
+    # Teardown: Stop the server
+    httpd.shutdown()
+    httpd.server_close()
+    server_thread.join()
@@ -1,41 +1,29 @@
 # tests/conftest.py
+import functools
 import pytest
 import os
 import shutil
-import http.server
-import socketserver
-import threading
+from unittest.mock import MagicMock
+from bs4 import BeautifulSoup
+from selenium.webdriver.remote.webdriver import WebDriver
+from src.browser_config import get_chrome_options
 from src.server import create_app
+from tests.conftest import FIXTURES_DIR
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Create and configure a new app instance for each test using the app factory."""
 
+    # Each test gets its own queue tree under tmp_path, which is also private to each
+    # pytest-xdist worker, so parallel runs never share queue files.
+    os.environ['QUEUE_BASE_PATH'] = str(tmp_path / "queues")
+
     # Create the app with testing configuration. This also creates the queue directories.
     app = create_app(testing=True)
-    base_path = app.config['BASE_QUEUE_PATH']
-
-    # The actions run in a separate process and don't have access to the app config,
-    # so we pass the test queue path via an environment variable.
-    os.environ['QUEUE_BASE_PATH'] = base_path
-
-    # --- Setup: Ensure a clean state before each test ---
-    # The create_app function already creates the directories. Here, we just ensure
-    # they are empty before the test runs.
-    if os.path.exists(base_path):
-        shutil.rmtree(base_path, ignore_errors=True)
-    
-    # Re-create all necessary directories for the test environment.
-    os.makedirs(os.path.join(base_path, 'inbound'), exist_ok=True)
-    os.makedirs(os.path.join(base_path, 'outbound'), exist_ok=True)
-    os.makedirs(os.path.join(base_path, 'consumed'), exist_ok=True)
-    os.makedirs(os.path.join(base_path, 'failed'), exist_ok=True)
-    os.makedirs(os.path.join(base_path, 'processing'), exist_ok=True)
 
     yield app
 
-    # --- Teardown: Clean up after each test ---
-    shutil.rmtree(base_path, ignore_errors=True)
+    # --- Teardown: pytest removes tmp_path itself ---
     del os.environ['QUEUE_BASE_PATH']
 
 @pytest.fixture
@@ -43,29 +31,81 @@ def client(app):
     """A test client for the app."""
     return app.test_client()
 
-@pytest.fixture(scope="module")
-def static_file_server():  # Renamed from 'live_server' to avoid conflict with pytest-flask
+
+@pytest.fixture(scope="session")
+def shared_driver(tmp_path_factory):
     """
-    Starts a simple HTTP server in a background thread to serve static files
-    from the 'tests/fixtures' directory.
+    Starts a single Chrome WebDriver for the whole test session so that live tests
+    don't each pay for a browser cold start. Actions that receive it leave it open.
     """
-    # Find an available port
-    with socketserver.TCPServer(("127.0.0.1", 0), None) as s:
-        port = s.server_address[1]
-
-    class Handler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory='tests/fixtures', **kwargs)
-
-    httpd = socketserver.TCPServer(("127.0.0.1", port), Handler)
-    
-    server_thread = threading.Thread(target=httpd.serve_forever)
-    server_thread.daemon = True
-    server_thread.start()
-
-    yield f"http://127.0.0.1:{port}"
-
-    # Teardown: Stop the server
-    httpd.shutdown()
-    httpd.server_close()
-    server_thread.join()
+    # Imported lazily so that sessions which never request a browser don't need selenium-stealth.
+    from src.actions import full_recursive_download
+
+    def get_test_chrome_options():
+        # Only for the test browser: chromedriver already turns off most background
+        # services, but not component updates, and there is nothing to listen to.
+        options = get_chrome_options()
+        options.add_argument('--disable-component-update')
+        options.add_argument('--mute-audio')
+        return options
+
+    session_dir = str(tmp_path_factory.mktemp("shared_driver"))
+    original_home = os.environ.get('HOME')
+    # _setup_driver points HOME at the browser's temp profile; restore it straight away.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(full_recursive_download, 'get_chrome_options', get_test_chrome_options)
+        driver, service = full_recursive_download._setup_driver(session_dir)
+    if original_home is None:
+        os.environ.pop('HOME', None)
+    else:
+        os.environ['HOME'] = original_home
+
+    yield driver
+
+    # Teardown: Quit the browser and remove its profile directory
+    driver.quit()
+    service.stop()
+    shutil.rmtree(driver.temp_dir, ignore_errors=True)
+
+@pytest.fixture
+def browser(shared_driver):
+    """The session WebDriver, reset to a blank page with no cookies before each test."""
+    shared_driver.delete_all_cookies()
+    shared_driver.get("about:blank")
+    return shared_driver
+
+@functools.lru_cache(maxsize=None)
+def _parse_fixture_page(fixture_name):
+    """Parses a saved page once per session and returns its body text and link targets."""
+    with open(os.path.join(FIXTURES_DIR, fixture_name), encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+    return soup.body.get_text(' ', strip=True), tuple(a_tag['href'] for a_tag in soup.find_all('a', href=True))
+
+@pytest.fixture
+def make_stub_driver():
+    """
+    Returns a factory for MagicMock WebDrivers that serve a saved page from 'tests/fixtures'
+    for every URL, so crawl and parse logic can be exercised without a browser or network.
+    The URLs requested through `get` are recorded in the stub's `visited_urls` list.
+    """
+    def _make_stub_driver(fixture_name):
+        body_text, hrefs = _parse_fixture_page(fixture_name)
+
+        driver = MagicMock(spec=WebDriver)
+        driver.visited_urls = []
+
+        def _get(url):
+            driver.visited_urls.append(url)
+            driver.current_url = url
+
+        driver.get.side_effect = _get
+        driver.find_element.return_value.text = body_text
+        anchors = []
+        for href in hrefs:
+            anchor = MagicMock()
+            anchor.get_attribute.return_value = href
+            anchors.append(anchor)
+        driver.find_elements.return_value = anchors
+        return driver
+
+    return _make_stub_driver
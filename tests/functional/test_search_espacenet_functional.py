@@ -1,8 +1,7 @@
 import pytest
-from unittest.mock import MagicMock
-import tempfile
+import os
 import shutil
-from src.actions.search_espacenet import execute
+from unittest.mock import MagicMock
 
 
 @pytest.mark.functional
@@ -14,15 +13,33 @@ class TestSearchEspacenetFunctional:
     """
 
     @pytest.fixture
-    def temp_dir(self):
-        """Pytest fixture to create and clean up a temporary directory for tests."""
-        temp_download_dir = tempfile.mkdtemp()
-        try:
-            yield temp_download_dir
-        finally:
-            shutil.rmtree(temp_download_dir)
-
-    def test_search_by_keywords(self, temp_dir):
+    def temp_dir(self, tmp_path):
+        """Pytest fixture providing a temporary download directory, managed by pytest's `tmp_path`."""
+        return str(tmp_path)
+
+    @pytest.fixture(scope="class")
+    def espacenet_driver(self, tmp_path_factory):
+        """
+        One undetected-chromedriver instance shared by every test in the class, so that the
+        Cloudflare clearance and cookies from the first Espacenet visit are reused.
+        """
+        # Imported here so that collecting this module doesn't load undetected-chromedriver
+        from src.actions.search_espacenet import _setup_driver
+
+        original_home = os.environ.get('HOME')
+        driver = _setup_driver(str(tmp_path_factory.mktemp("espacenet")))
+        # _setup_driver points HOME at the browser's temp profile; restore it straight away.
+        if original_home is None:
+            os.environ.pop('HOME', None)
+        else:
+            os.environ['HOME'] = original_home
+
+        yield driver
+
+        driver.quit()
+        shutil.rmtree(driver.temp_dir, ignore_errors=True)
+
+    def test_search_by_keywords(self, temp_dir, espacenet_driver):
         """
         Tests a real search for patents by keywords to verify the scraper can handle
         a live query. We limit the results to keep the test quick.
@@ -34,21 +51,18 @@ class TestSearchEspacenetFunctional:
             ],
             "max_number_of_patents": 50
         }
+        from src.actions.search_espacenet import execute
+
         mock_write_result = MagicMock()
-        driver = None
-        try:
-            driver = execute(job_id, params, temp_dir, mock_write_result, quit_driver=False)
-
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
-
-            assert result['job_id'] == job_id
-            assert result['status'] == 'Completed'
-            assert 'error' not in result
-
-            patents = result['result']['patents']
-            assert len(patents) > 0
-            assert len(patents) <= 100
-        finally:
-            if driver:
-                driver.quit()
+        execute(job_id, params, temp_dir, mock_write_result, driver=espacenet_driver)
+
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
+
+        assert result['job_id'] == job_id
+        assert result['status'] == 'Completed'
+        assert 'error' not in result
+
+        patents = result['result']['patents']
+        assert len(patents) > 0
+        assert len(patents) <= 100
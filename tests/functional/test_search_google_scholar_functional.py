@@ -1,7 +1,6 @@
 import pytest
+import os
 from unittest.mock import MagicMock
-import tempfile
-import shutil
 from src.actions.search_google_scholar import execute
 
 
@@ -14,17 +13,11 @@ class TestSearchGoogleScholarFunctional:
     """
 
     @pytest.fixture
-    def temp_dir(self):
-        """
-        Pytest fixture to create and clean up a temporary directory for tests.
-        """
-        temp_download_dir = tempfile.mkdtemp()
-        try:
-            yield temp_download_dir
-        finally:
-            shutil.rmtree(temp_download_dir)
+    def temp_dir(self, tmp_path):
+        """Pytest fixture providing a temporary download directory, managed by pytest's `tmp_path`."""
+        return str(tmp_path)
 
-    def test_search_by_author_name(self, temp_dir):
+    def test_search_by_author_name(self, temp_dir, browser):
         """
         Tests a real search for an author to verify the scraper can handle
         a live author query. We limit the results to keep the test quick.
@@ -38,13 +31,13 @@ class TestSearchGoogleScholarFunctional:
             "fetch_author_details": "none",  # Keep test fast, don't fetch details
         }
         mock_write_result = MagicMock()
-        print(params)
 
-        execute(job_id, params, temp_dir, mock_write_result)
+        execute(job_id, params, temp_dir, mock_write_result, driver=browser)
 
         mock_write_result.assert_called_once()
         _, result = mock_write_result.call_args[0]
-        print(result)
+        if os.environ.get('VERBOSE_TESTS'):
+            print(result)
 
         assert result['job_id'] == job_id
         assert result['status'] == 'Completed'
@@ -58,7 +51,7 @@ class TestSearchGoogleScholarFunctional:
         found_author = any("Lantz" in article['raw_author_line'] for article in articles)
         assert found_author, "Expected to find 'Lantz' in the author line of the results"
 
-    def test_search_by_keyword(self, temp_dir):
+    def test_search_by_keyword(self, temp_dir, browser):
         """
         Tests a real search for a keyword to verify the scraper can handle
         a live keyword query. We limit the results to keep the test quick.
@@ -73,7 +66,7 @@ class TestSearchGoogleScholarFunctional:
         }
         mock_write_result = MagicMock()
 
-        execute(job_id, params, temp_dir, mock_write_result)
+        execute(job_id, params, temp_dir, mock_write_result, driver=browser)
 
         mock_write_result.assert_called_once()
         _, result = mock_write_result.call_args[0]
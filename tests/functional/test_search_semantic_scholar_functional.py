@@ -1,7 +1,5 @@
 import pytest
 from unittest.mock import MagicMock
-import tempfile
-import shutil
 from src.actions.search_semantic_scholar import execute
 
 
@@ -14,15 +12,11 @@ class TestSearchSemanticScholarFunctional:
     """
 
     @pytest.fixture
-    def temp_dir(self):
-        """Pytest fixture to create and clean up a temporary directory for tests."""
-        temp_download_dir = tempfile.mkdtemp()
-        try:
-            yield temp_download_dir
-        finally:
-            shutil.rmtree(temp_download_dir)
+    def temp_dir(self, tmp_path):
+        """Pytest fixture providing a temporary download directory, managed by pytest's `tmp_path`."""
+        return str(tmp_path)
 
-    def test_search_by_author_name(self, temp_dir):
+    def test_search_by_author_name(self, temp_dir, browser):
         """
         Tests a real search for an author to verify the scraper can handle
         a live author query. We limit the results to keep the test quick.
@@ -37,7 +31,7 @@ class TestSearchSemanticScholarFunctional:
         }
         mock_write_result = MagicMock()
 
-        execute(job_id, params, temp_dir, mock_write_result)
+        execute(job_id, params, temp_dir, mock_write_result, driver=browser)
 
         mock_write_result.assert_called_once()
         _, result = mock_write_result.call_args[0]
@@ -53,7 +47,7 @@ class TestSearchSemanticScholarFunctional:
         found_author = any("Morillon" in author['name'] for article in articles for author in article['authors'])
         assert found_author, "Expected to find 'Morillon' in the author list of the results"
 
-    def test_search_by_keyword(self, temp_dir):
+    def test_search_by_keyword(self, temp_dir, browser):
         """
         Tests a real search for a keyword to verify the scraper can handle
         a live keyword query. We limit the results to keep the test quick.
@@ -68,7 +62,7 @@ class TestSearchSemanticScholarFunctional:
         }
         mock_write_result = MagicMock()
 
-        execute(job_id, params, temp_dir, mock_write_result)
+        execute(job_id, params, temp_dir, mock_write_result, driver=browser)
 
         mock_write_result.assert_called_once()
         _, result = mock_write_result.call_args[0]
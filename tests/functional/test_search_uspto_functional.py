@@ -1,7 +1,5 @@
 import pytest
 from unittest.mock import MagicMock
-import tempfile
-import shutil
 from src.actions.search_uspto import execute
 
 
@@ -14,13 +12,9 @@ class TestSearchUsptoFunctional:
     """
 
     @pytest.fixture
-    def temp_dir(self):
-        """Pytest fixture to create and clean up a temporary directory for tests."""
-        temp_download_dir = tempfile.mkdtemp()
-        try:
-            yield temp_download_dir
-        finally:
-            shutil.rmtree(temp_download_dir)
+    def temp_dir(self, tmp_path):
+        """Pytest fixture providing a temporary download directory, managed by pytest's `tmp_path`."""
+        return str(tmp_path)
 
     def test_search_by_keywords(self, temp_dir):
         """
@@ -1,22 +1,25 @@
 import os
 import json
-import time
-import logging
-
-from src.server import process_inbound_queue
-
-def poll_for_result(client, job_id, timeout=30):
-    """Polls the outbound endpoint until the job is complete or times out."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        response = client.get(f'/outbound?job_id={job_id}')
-        if response.status_code == 200:
-            data = response.get_json()
-            logging.info(f"Polling for job {job_id}, status: {data.get('status')}")
-            if data.get('status') == 'Completed':
-                return data
-        time.sleep(0.5)
-    return None
+import threading
+from pathlib import Path
+
+from src.server import process_inbound_queue, _is_dir_empty
+
+def _write_message(directory, filename, payload):
+    """Writes a pre-serialized queue message file in a single call."""
+    Path(directory, filename).write_bytes(payload)
+
+def read_result(app, job_id):
+    """
+    Returns the job's result straight from the outbound queue, or None if there is none.
+    In testing mode process_inbound_queue runs actions inline, so the result file is
+    already written when it returns and there is nothing to wait for.
+    """
+    try:
+        with open(os.path.join(app.config['OUTBOUND_DIR'], f"{job_id}.json"), 'rb') as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
 
 def test_get_all_messages_action_empty(client, app):
     """Test that the get_all_messages action returns an empty structure when no messages exist."""
@@ -24,14 +27,13 @@ def test_get_all_messages_action_empty(client, app):
     response = client.post('/inbound', json={'action': 'get_all_messages'})
     assert response.status_code == 200
     job_id = response.get_json()['job_id']
-    time.sleep(0.1) # Give the filesystem time to create the file
 
-    process_inbound_queue(app)  # Manually trigger processing
+    process_inbound_queue(app, threading.Event())  # Manually trigger processing
 
-    data = poll_for_result(client, job_id)
+    data = read_result(app, job_id)
 
     # 3. ASSERT
-    assert data is not None, "Polling for result timed out."
+    assert data is not None, "No result was written for the job."
     assert data['status'] == 'Completed'
     messages = data['result']
     assert messages['inbound'] == []
@@ -41,34 +43,25 @@ def test_get_all_messages_action_empty(client, app):
 def test_get_all_messages_action_with_data(client, app):
     """Test the get_all_messages action with messages in various queues."""
     # 1. ARRANGE
-    base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(base_path, 'inbound')
-    consumed_dir = os.path.join(base_path, 'consumed')
-    failed_dir = os.path.join(base_path, 'failed')
-
-    inbound_msg = {"test": "inbound_data"}
-    consumed_msg = {"test": "consumed_data"}
-    failed_msg = {"test": "failed_data"}
-
-    with open(os.path.join(inbound_dir, 'inbound.json'), 'w') as f:
-        json.dump(inbound_msg, f)
-    with open(os.path.join(consumed_dir, 'consumed.json'), 'w') as f:
-        json.dump(consumed_msg, f)
-    with open(os.path.join(failed_dir, 'failed.json'), 'w') as f:
-        json.dump(failed_msg, f)
+    inbound_dir = app.config['INBOUND_DIR']
+    consumed_dir = app.config['CONSUMED_DIR']
+    failed_dir = app.config['FAILED_DIR']
+
+    _write_message(inbound_dir, 'inbound.json', b'{"test": "inbound_data"}')
+    _write_message(consumed_dir, 'consumed.json', b'{"test": "consumed_data"}')
+    _write_message(failed_dir, 'failed.json', b'{"test": "failed_data"}')
 
     # 2. ACT
     response = client.post('/inbound', json={'action': 'get_all_messages'})
     assert response.status_code == 200
     job_id = response.get_json()['job_id']
-    time.sleep(0.1) # Give the filesystem time to create the file
 
-    process_inbound_queue(app)
+    process_inbound_queue(app, threading.Event())
 
-    data = poll_for_result(client, job_id)
+    data = read_result(app, job_id)
 
     # 3. ASSERT
-    assert data is not None, "Polling for result timed out."
+    assert data is not None, "No result was written for the job."
     assert data['status'] == 'Completed'
     messages = data['result']
     
@@ -86,81 +79,79 @@ def test_get_all_messages_action_with_data(client, app):
 def test_clear_all_messages_action(client, app):
     """Test the clear_all_messages action."""
     # 1. ARRANGE
-    base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(base_path, 'inbound')
-    consumed_dir = os.path.join(base_path, 'consumed')
-    failed_dir = os.path.join(base_path, 'failed')
+    inbound_dir = app.config['INBOUND_DIR']
+    consumed_dir = app.config['CONSUMED_DIR']
+    failed_dir = app.config['FAILED_DIR']
 
     # Create dummy files in each directory to ensure they are cleared.
-    with open(os.path.join(inbound_dir, 'dummy_inbound.json'), 'w') as f:
-        json.dump({'action': 'dummy_action'}, f)
-    with open(os.path.join(consumed_dir, 'dummy_consumed.json'), 'w') as f:
-        json.dump({'test': 'dummy'}, f)
-    with open(os.path.join(failed_dir, 'dummy_failed.json'), 'w') as f:
-        json.dump({'test': 'dummy'}, f)
+    _write_message(inbound_dir, 'dummy_inbound.json', b'{"action": "dummy_action"}')
+    _write_message(consumed_dir, 'dummy_consumed.json', b'{"test": "dummy"}')
+    _write_message(failed_dir, 'dummy_failed.json', b'{"test": "dummy"}')
 
     # 2. ACT
     response = client.post('/inbound', json={'action': 'clear_all_messages'})
     assert response.status_code == 200
     job_id = response.get_json()['job_id']
-    time.sleep(0.1)  # Give the filesystem time to create the file
 
-    process_inbound_queue(app)
+    process_inbound_queue(app, threading.Event())
 
-    data = poll_for_result(client, job_id)
+    # Fetched through the endpoint, as a client would, which moves the result to consumed/.
+    response = client.get(f'/outbound?job_id={job_id}')
+    assert response.status_code == 200
+    data = response.get_json()
 
     # 3. ASSERT
-    assert data is not None, "Polling for result timed out."
+    assert data is not None, "No result was written for the job."
     assert data['status'] == 'Completed'
     assert data['result']['message'] == 'All queues cleared successfully.'
     assert set(data['result']['cleared_queues']) == {'inbound', 'consumed', 'failed'}
 
     # inbound and failed queues should be empty.
-    assert not os.listdir(inbound_dir)
-    assert not os.listdir(failed_dir)
+    assert _is_dir_empty(inbound_dir)
+    assert _is_dir_empty(failed_dir)
 
-    # The consumed queue should only contain the message and result for the
-    # 'clear_all_messages' action itself.
-    consumed_files = os.listdir(consumed_dir)
+    # The consumed queue should only contain the message for the 'clear_all_messages'
+    # action itself and the result fetched above, which left the outbound queue.
+    consumed_files = sorted(os.listdir(consumed_dir))
     assert len(consumed_files) == 2
-    assert any(f.endswith(f'_{job_id}.json') for f in consumed_files)
-    assert f'result_{job_id}.json' in consumed_files
+    assert consumed_files[0].endswith(f'_{job_id}.json')
+    assert consumed_files[1] == f'result_{job_id}.json'
+    assert _is_dir_empty(app.config['OUTBOUND_DIR'])
 
 def test_clear_all_messages_action_when_empty(client, app):
     """Test that the clear_all_messages action works correctly when queues are already empty."""
     # 1. ARRANGE
-    base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(base_path, 'inbound')
-    consumed_dir = os.path.join(base_path, 'consumed')
-    failed_dir = os.path.join(base_path, 'failed')
+    inbound_dir = app.config['INBOUND_DIR']
+    consumed_dir = app.config['CONSUMED_DIR']
+    failed_dir = app.config['FAILED_DIR']
 
     # 2. ACT
     response = client.post('/inbound', json={'action': 'clear_all_messages'})
     assert response.status_code == 200
     job_id = response.get_json()['job_id']
-    time.sleep(0.1) # Give the filesystem time to create the file
 
-    process_inbound_queue(app)
+    process_inbound_queue(app, threading.Event())
 
-    data = poll_for_result(client, job_id)
+    data = read_result(app, job_id)
 
     # 3. ASSERT
-    assert data is not None, "Polling for result timed out."
+    assert data is not None, "No result was written for the job."
     assert data['status'] == 'Completed'
     assert data['result']['message'] == 'All queues cleared successfully.'
     # Even if empty, the action reports it "cleared" them.
     assert set(data['result']['cleared_queues']) == {'inbound', 'consumed', 'failed'}
 
     # inbound and failed queues should be empty.
-    assert not os.listdir(inbound_dir)
-    assert not os.listdir(failed_dir)
+    assert _is_dir_empty(inbound_dir)
+    assert _is_dir_empty(failed_dir)
 
-    # The consumed queue should only contain the message and result for the
-    # 'clear_all_messages' action itself.
+    # The consumed queue should only contain the message for the 'clear_all_messages'
+    # action itself. Its result is still waiting in the outbound queue, since it was
+    # read directly rather than fetched through the endpoint.
     consumed_files = os.listdir(consumed_dir)
-    assert len(consumed_files) == 2
-    assert any(f.endswith(f'_{job_id}.json') for f in consumed_files)
-    assert f'result_{job_id}.json' in consumed_files
+    assert len(consumed_files) == 1
+    assert consumed_files[0].endswith(f'_{job_id}.json')
+    assert os.listdir(app.config['OUTBOUND_DIR']) == [f'{job_id}.json']
 
 def test_get_messages_status_empty(client):
     """Test that the /queues endpoint returns an empty structure when no messages exist."""
@@ -182,29 +173,17 @@ def test_get_messages_status_empty(client):
 def test_get_messages_status_with_data(client, app):
     """Test the /queues endpoint with messages in various queues."""
     # 1. ARRANGE
-    base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(base_path, 'inbound')
-    outbound_dir = os.path.join(base_path, 'outbound')
-    consumed_dir = os.path.join(base_path, 'consumed')
-    failed_dir = os.path.join(base_path, 'failed')
-    processing_dir = os.path.join(base_path, 'processing')
-
-    inbound_msg = {"test": "inbound_data"}
-    outbound_msg = {"test": "outbound_data"}
-    consumed_msg = {"test": "consumed_data"}
-    failed_msg = {"test": "failed_data"}
-    processing_msg = {"test": "processing_data"}
-
-    with open(os.path.join(inbound_dir, 'inbound.json'), 'w') as f:
-        json.dump(inbound_msg, f)
-    with open(os.path.join(outbound_dir, 'outbound.json'), 'w') as f:
-        json.dump(outbound_msg, f)
-    with open(os.path.join(consumed_dir, 'consumed.json'), 'w') as f:
-        json.dump(consumed_msg, f)
-    with open(os.path.join(failed_dir, 'failed.json'), 'w') as f:
-        json.dump(failed_msg, f)
-    with open(os.path.join(processing_dir, 'processing.json'), 'w') as f:
-        json.dump(processing_msg, f)
+    inbound_dir = app.config['INBOUND_DIR']
+    outbound_dir = app.config['OUTBOUND_DIR']
+    consumed_dir = app.config['CONSUMED_DIR']
+    failed_dir = app.config['FAILED_DIR']
+    processing_dir = app.config['PROCESSING_DIR']
+
+    _write_message(inbound_dir, 'inbound.json', b'{"test": "inbound_data"}')
+    _write_message(outbound_dir, 'outbound.json', b'{"test": "outbound_data"}')
+    _write_message(consumed_dir, 'consumed.json', b'{"test": "consumed_data"}')
+    _write_message(failed_dir, 'failed.json', b'{"test": "failed_data"}')
+    _write_message(processing_dir, 'processing.json', b'{"test": "processing_data"}')
 
     # 2. ACT
     response = client.get('/queues')
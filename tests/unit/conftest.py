@@ -1,18 +1,34 @@
 # tests/conftest.py
 import pytest
 import os
-import shutil
-import http.server
-import socketserver
-import threading
-from src.server import create_app
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import wait as selenium_wait
+from src.server import create_app, configure_queue_paths, write_result_to_outbound, QUEUE_NAMES
+
+@pytest.fixture(scope="session")
+def _app(tmp_path_factory):
+    """
+    Creates the Flask app once for the whole session. The function-scoped `app` fixture
+    re-points it at a fresh queue tree for every test.
+    """
+    # The variable is only read by create_app, so it is not left set for the rest of the
+    # session, where it would collide with the functional tests' own app fixture.
+    os.environ['QUEUE_BASE_PATH'] = str(tmp_path_factory.mktemp("session_queues"))
+    try:
+        return create_app(testing=True)
+    finally:
+        del os.environ['QUEUE_BASE_PATH']
 
 @pytest.fixture
-def app(request, tmp_path):
+def app(_app, request, tmp_path):
     """
-    Create and configure a new app instance for each test.
-    This fixture sets the QUEUE_BASE_PATH environment variable before app creation,
-    ensuring the app and tests operate on the same directory.
+    The session app, pointed at an empty queue tree under this test's `tmp_path`.
+    pytest removes `tmp_path` itself, so there is nothing to clean up afterwards.
     """
     # Default path for tests that don't specify one.
     queue_base_path = tmp_path / "queues"
@@ -21,54 +37,104 @@ def app(request, tmp_path):
     if hasattr(request, "param") and callable(request.param):
         queue_base_path = request.param(tmp_path)
 
-    os.environ['QUEUE_BASE_PATH'] = str(queue_base_path)
+    configure_queue_paths(_app, str(queue_base_path))
+    for queue_name in QUEUE_NAMES:
+        os.makedirs(_app.config[f'{queue_name.upper()}_DIR'], exist_ok=True)
+    _app.config['LAST_API_CALL'] = time.time()
 
-    # Create the app with testing configuration
-    app = create_app(testing=True)
+    yield _app
 
-    # The base path is now set within create_app, but we still need to clean it up
-    base_path = app.config['BASE_QUEUE_PATH']
+def make_element(text=None, attrs=None, children=None):
+    """
+    Builds a stand-in for a WebElement that an action only reads: its `text`, the
+    attributes returned by `get_attribute`, and the children found under each selector,
+    given as one element or a list. As on a real page, `find_element` raises
+    NoSuchElementException for a selector with no children.
+    """
+    attrs = attrs or {}
+    children = {selector: found if isinstance(found, list) else [found]
+                for selector, found in (children or {}).items()}
 
-    # --- Setup: Ensure a clean state before each test ---
-    if os.path.exists(base_path):
-        shutil.rmtree(base_path)
+    def find_element(by, selector):
+        if not children.get(selector):
+            raise NoSuchElementException(selector)
+        return children[selector][0]
 
-    # Re-create directories for the test
-    for dir_name in ['inbound', 'outbound', 'consumed', 'failed', 'processing']:
-        os.makedirs(os.path.join(base_path, dir_name), exist_ok=True)
+    return SimpleNamespace(
+        text=text,
+        get_attribute=attrs.get,
+        find_element=find_element,
+        find_elements=lambda by, selector: children.get(selector, []),
+    )
 
-    yield app
+class FakeClock:
+    """
+    Stands in for the `time` module of the actions and of Selenium's WebDriverWait.
+    Sleeping only moves the clock forward, so pauses and wait timeouts elapse instantly.
+    """
+    def __init__(self):
+        self.now = time.monotonic()
 
-    # --- Teardown: Clean up after each test ---
-    shutil.rmtree(base_path)
-    del os.environ['QUEUE_BASE_PATH']
+    def sleep(self, seconds):
+        self.now += seconds
 
-@pytest.fixture
-def client(app):
-    """A test client for the app."""
-    return app.test_client()
+    def monotonic(self):
+        return self.now
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+@pytest.fixture(autouse=True)
+def fake_clock(monkeypatch):
+    """
+    Puts every loaded action module, and Selenium's wait loop, on a FakeClock so mocked
+    drivers never make a unit test sit out real `time.sleep` calls or WebDriverWait timeouts.
+    The global time module is left alone.
+    """
+    clock = FakeClock()
+    monkeypatch.setattr(selenium_wait, 'time', clock)
+    for name, module in list(sys.modules.items()):
+        if name.startswith(('src.actions.', 'actions.')):
+            if getattr(module, 'time', None) is time:
+                monkeypatch.setattr(module, 'time', clock)
+            if getattr(module, 'sleep', None) is time.sleep:
+                monkeypatch.setattr(module, 'sleep', clock.sleep)
+    return clock
 
-@pytest.fixture(scope="module")
-def static_file_server():
+@pytest.fixture
+def mock_driver():
     """
-    Starts a simple HTTP server in a background thread to serve static files
-    from the 'tests/fixtures' directory.
+    A fresh MagicMock limited to the WebDriver API, so a misspelt driver call fails
+    instead of passing silently.
     """
-    with socketserver.TCPServer(("127.0.0.1", 0), None) as s:
-        port = s.server_address[1]
+    return MagicMock(spec=WebDriver)
 
-    class Handler(http.server.SimpleHTTPRequestHandler):
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, directory='tests/fixtures', **kwargs)
+@pytest.fixture
+def mock_write_result():
+    """
+    Stands in for `write_result_to_outbound` when an action is called directly. It is
+    autospecced, so an action calling it with the wrong arguments fails the test.
+    """
+    return create_autospec(write_result_to_outbound)
 
-    httpd = socketserver.TCPServer(("127.0.0.1", port), Handler)
-    
-    server_thread = threading.Thread(target=httpd.serve_forever)
-    server_thread.daemon = True
-    server_thread.start()
+@pytest.fixture
+def patch_module(monkeypatch):
+    """
+    Returns a function that replaces the named attributes of a module with fresh MagicMocks
+    for the duration of the test. The mocks come back in a SimpleNamespace, each under its
+    attribute name without the leading underscore, e.g. `_setup_driver` as `setup_driver`.
+    """
+    def _patch_module(module, *names):
+        mocks = SimpleNamespace()
+        for name in names:
+            mock = MagicMock()
+            monkeypatch.setattr(module, name, mock)
+            setattr(mocks, name.lstrip('_'), mock)
+        return mocks
 
-    yield f"http://127.0.0.1:{port}"
+    return _patch_module
 
-    httpd.shutdown()
-    httpd.server_close()
-    server_thread.join()
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
@@ -1,11 +1,9 @@
-import sys
 import os
-import pytest
+from pathlib import Path
 from unittest.mock import MagicMock
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
-
 from actions import clear_all_messages
+from src.server import _is_dir_empty
 
 def test_clear_all_messages(app):
     """
@@ -17,15 +15,14 @@ def test_clear_all_messages(app):
     params = {}
 
     # Directories are created by the app fixture. Get their paths from the app config.
-    queue_base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(queue_base_path, "inbound")
-    consumed_dir = os.path.join(queue_base_path, "consumed")
-    failed_dir = os.path.join(queue_base_path, "failed")
+    inbound_dir = app.config['INBOUND_DIR']
+    consumed_dir = app.config['CONSUMED_DIR']
+    failed_dir = app.config['FAILED_DIR']
 
     # Create dummy message files
-    (open(os.path.join(inbound_dir, "msg1.json"), "w")).close()
-    (open(os.path.join(consumed_dir, "msg2.json"), "w")).close()
-    (open(os.path.join(failed_dir, "msg3.json"), "w")).close()
+    Path(inbound_dir, "msg1.json").write_bytes(b'')
+    Path(consumed_dir, "msg2.json").write_bytes(b'')
+    Path(failed_dir, "msg3.json").write_bytes(b'')
 
     mock_write_result = MagicMock()
 
@@ -37,9 +34,9 @@ def test_clear_all_messages(app):
     assert os.path.exists(inbound_dir)
     assert os.path.exists(consumed_dir)
     assert os.path.exists(failed_dir)
-    assert not os.listdir(inbound_dir)
-    assert not os.listdir(consumed_dir)
-    assert not os.listdir(failed_dir)
+    assert _is_dir_empty(inbound_dir)
+    assert _is_dir_empty(consumed_dir)
+    assert _is_dir_empty(failed_dir)
 
     mock_write_result.assert_called_once()
     args, _ = mock_write_result.call_args
@@ -1,11 +1,8 @@
-import sys
-import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call
 import pytest
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
-
 # Import the function to be tested
+from actions import drooms_scraping
 from actions.drooms_scraping import execute, _sanitize_filename
 
 # --- Test Cases for drooms_scraping ---
@@ -18,37 +15,41 @@ def test_execute_missing_parameters():
     write_mock = MagicMock()
     job_id = 'test-job-1'
     download_dir = '/tmp/output'
+    missing_parameters_error = {
+        "status": "error",
+        "message": "Missing required parameters: url, username, or password."
+    }
     
     # ACT & ASSERT for missing all params
     params_none = {}
     execute(job_id, params_none, download_dir, write_mock)
-    write_mock.assert_called_with(job_id, {
-        "status": "error", 
-        "message": "Missing required parameters: url, username, or password."
-    })
+    assert write_mock.call_args == call(job_id, missing_parameters_error)
 
     # ACT & ASSERT for one missing param
     params_missing_pw = {'url': 'some_url', 'username': 'some_user'}
     execute(job_id, params_missing_pw, download_dir, write_mock)
-    write_mock.assert_called_with(job_id, {
-        "status": "error", 
-        "message": "Missing required parameters: url, username, or password."
-    })
+    assert write_mock.call_args == call(job_id, missing_parameters_error)
+
+@pytest.fixture
+def drooms_mocks(patch_module, mock_driver):
+    """
+    Mocks the D-Rooms login, folder expansion and item processing steps, and the download
+    root creation, so `execute` runs end to end without a browser or the C:/temp tree.
+    `_setup_driver` hands out the test's `mock_driver` with a mock service.
+    """
+    mocks = patch_module(drooms_scraping, 'WebDriverWait', '_setup_driver', '_login',
+                         '_expand_all_folders', '_gather_all_items', '_process_all_items')
+    mocks.makedirs = patch_module(drooms_scraping.os, 'makedirs').makedirs
+    mocks.driver = mock_driver
+    mocks.setup_driver.return_value = (mocks.driver, MagicMock())
+    return mocks
 
-@patch('actions.drooms_scraping.os.makedirs')
-@patch('actions.drooms_scraping.WebDriverWait')
-@patch('actions.drooms_scraping._expand_all_folders')
-@patch('actions.drooms_scraping._login')
-@patch('actions.drooms_scraping._setup_driver')
-@patch('actions.drooms_scraping._gather_all_items')
-@patch('actions.drooms_scraping._process_all_items')
-def test_execute_success(mock_process_all, mock_gather_all, mock_setup_driver, mock_login, mock_expand, mock_wait, mock_makedirs):
+def test_execute_success(drooms_mocks):
     """
     Tests the success scenario for the drooms_scraping action by mocking helper functions.
     """
     # ARRANGE
-    mock_driver = MagicMock()
-    mock_setup_driver.return_value = (mock_driver, MagicMock())
+    mock_driver = drooms_mocks.driver
     write_mock = MagicMock()
     job_id = 'test-job-2'
     download_dir = '/tmp/test-job'
@@ -63,11 +64,11 @@ def test_execute_success(mock_process_all, mock_gather_all, mock_setup_driver, m
     execute(job_id, params, download_dir, write_mock)
 
     # ASSERT
-    mock_makedirs.assert_called()
-    mock_setup_driver.assert_called_once()
-    mock_login.assert_called_once_with(mock_driver, params['url'], params['username'], params['password'])
-    mock_wait.assert_called()
-    mock_expand.assert_called_once_with(mock_driver, debug_mode=False)
+    drooms_mocks.makedirs.assert_called()
+    drooms_mocks.setup_driver.assert_called_once()
+    drooms_mocks.login.assert_called_once_with(mock_driver, params['url'], params['username'], params['password'])
+    drooms_mocks.WebDriverWait.assert_called()
+    drooms_mocks.expand_all_folders.assert_called_once_with(mock_driver, debug_mode=False)
     
     # The final success message uses a hardcoded path
     expected_download_root = 'C:/temp/drooms_scraping'
@@ -78,16 +79,13 @@ def test_execute_success(mock_process_all, mock_gather_all, mock_setup_driver, m
     
     mock_driver.quit.assert_called_once()
 
-@patch('actions.drooms_scraping.os.makedirs')
-@patch('actions.drooms_scraping._login', side_effect=Exception("Login failed"))
-@patch('actions.drooms_scraping._setup_driver')
-def test_execute_login_failure(mock_setup_driver, mock_login, mock_makedirs):
+def test_execute_login_failure(drooms_mocks):
     """
     Tests the failure scenario when login fails.
     """
     # ARRANGE
-    mock_driver = MagicMock()
-    mock_setup_driver.return_value = (mock_driver, MagicMock())
+    mock_driver = drooms_mocks.driver
+    drooms_mocks.login.side_effect = Exception("Login failed")
     write_mock = MagicMock()
     job_id = 'test-job-3'
     download_dir = '/tmp/test-job'
@@ -102,9 +100,9 @@ def test_execute_login_failure(mock_setup_driver, mock_login, mock_makedirs):
     execute(job_id, params, download_dir, write_mock)
 
     # ASSERT
-    mock_makedirs.assert_called()
-    mock_setup_driver.assert_called_once()
-    mock_login.assert_called_once()
+    drooms_mocks.makedirs.assert_called()
+    drooms_mocks.setup_driver.assert_called_once()
+    drooms_mocks.login.assert_called_once()
     
     write_mock.assert_called_with(job_id, {
         "status": "error", 
@@ -114,10 +112,13 @@ def test_execute_login_failure(mock_setup_driver, mock_login, mock_makedirs):
     mock_driver.save_screenshot.assert_called_once()
     mock_driver.quit.assert_called_once()
 
-def test_sanitize_filename():
+@pytest.mark.parametrize("filename,expected", [
+    ("file/name with:invalid\\chars?", "file_name with_invalid_chars_"),
+    ("a\nb\nc", "a b c"),
+    ("  leading and trailing spaces  ", "leading and trailing spaces"),
+])
+def test_sanitize_filename(filename, expected):
     """
     Tests the _sanitize_filename helper function.
     """
-    assert _sanitize_filename("file/name with:invalid\\chars?") == "file_name with_invalid_chars_"
-    assert _sanitize_filename("a\nb\nc") == "a b c"
-    assert _sanitize_filename("  leading and trailing spaces  ") == "leading and trailing spaces"
+    assert _sanitize_filename(filename) == expected
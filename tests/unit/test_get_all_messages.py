@@ -1,12 +1,10 @@
-import sys
-import os
+import orjson
 import pytest
-import json
-from unittest.mock import MagicMock, patch
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from pathlib import Path
+from unittest.mock import MagicMock
 
 from actions import full_recursive_download, get_all_messages
+from src.queue_config import FAILED_MARKER_SUFFIX
 
 def test_full_recursive_download_missing_url(app):
     """
@@ -28,7 +26,7 @@ def test_full_recursive_download_missing_url(app):
     # Ensure no result was written by the action itself
     mock_write_result.assert_not_called()
 
-def test_get_all_messages(tmp_path, app):
+def test_get_all_messages(app):
     """
     Tests that the 'get_all_messages' action correctly retrieves all messages
     from the inbound, consumed, and failed queues.
@@ -37,33 +35,21 @@ def test_get_all_messages(tmp_path, app):
     job_id = "test-get-all-messages"
     params = {}
 
-    # Create mock queue directories
-    queue_base_path = tmp_path / "queues"
-    inbound_dir = queue_base_path / "inbound"
-    consumed_dir = queue_base_path / "consumed"
-    failed_dir = queue_base_path / "failed"
-    inbound_dir.mkdir(parents=True, exist_ok=True)
-    consumed_dir.mkdir(parents=True, exist_ok=True)
-    failed_dir.mkdir(parents=True, exist_ok=True)
-
-    # Create dummy message files
+    # Create dummy message files in the queue directories the app fixture created.
     inbound_msg = {"action": "test_action_1"}
     consumed_msg = {"action": "test_action_2"}
     failed_msg = {"action": "test_action_3"}
 
-    with open(inbound_dir / "msg1.json", "w") as f:
-        json.dump(inbound_msg, f)
-    with open(consumed_dir / "msg2.json", "w") as f:
-        json.dump(consumed_msg, f)
-    with open(failed_dir / "msg3.json", "w") as f:
-        json.dump(failed_msg, f)
+    Path(app.config['INBOUND_DIR'], "msg1.json").write_bytes(orjson.dumps(inbound_msg))
+    Path(app.config['CONSUMED_DIR'], "msg2.json").write_bytes(orjson.dumps(consumed_msg))
+    Path(app.config['FAILED_DIR'], "msg3.json").write_bytes(orjson.dumps(failed_msg))
 
     mock_write_result = MagicMock()
 
-    with patch.dict(os.environ, {'QUEUE_BASE_PATH': str(queue_base_path)}):
-        with app.app_context():
-            # 2. ACT
-            get_all_messages.execute(job_id, params, None, mock_write_result)
+    # The action reads the queue base path from the app config.
+    with app.app_context():
+        # 2. ACT
+        get_all_messages.execute(job_id, params, None, mock_write_result)
 
     # 3. ASSERT
     mock_write_result.assert_called_once()
@@ -78,4 +64,34 @@ def test_get_all_messages(tmp_path, app):
     assert len(messages['consumed']) == 1
     assert messages['consumed'][0] == consumed_msg
     assert len(messages['failed']) == 1
-    assert messages['failed'][0] == failed_msg
\ No newline at end of file
+    assert messages['failed'][0] == failed_msg
+
+
+@pytest.mark.parametrize("message_count", [1, 1000])
+def test_get_all_messages_returns_every_message_in_order(app, message_count):
+    """
+    Tests that 'get_all_messages' returns every message of large queues in file name order,
+    skipping the failure markers that sit next to the failed messages.
+    """
+    # 1. ARRANGE
+    job_id = "test-get-all-messages-many"
+    queue_dirs = {queue: app.config[f'{queue.upper()}_DIR'] for queue in ('inbound', 'consumed', 'failed')}
+    for queue, queue_dir in queue_dirs.items():
+        # Written newest first, so the result order cannot come from creation order.
+        for i in reversed(range(message_count)):
+            Path(queue_dir, f"msg{i:05d}.json").write_bytes(b'{"queue": "%s", "index": %d}' % (queue.encode(), i))
+    for i in range(message_count):
+        Path(queue_dirs['failed'], f"msg{i:05d}{FAILED_MARKER_SUFFIX}").touch()
+
+    mock_write_result = MagicMock()
+
+    with app.app_context():
+        # 2. ACT
+        get_all_messages.execute(job_id, {}, None, mock_write_result)
+
+    # 3. ASSERT
+    mock_write_result.assert_called_once()
+    messages = mock_write_result.call_args[0][1]['result']
+    for queue in queue_dirs:
+        assert [message['index'] for message in messages[queue]] == list(range(message_count))
+        assert all(message['queue'] == queue for message in messages[queue])
@@ -1,5 +1,6 @@
 # tests/unit/test_inbound_api.py
 import json
+import os
 
 def test_receive_task_success(client):
     """Test the /inbound endpoint with valid data."""
@@ -24,4 +25,37 @@ def test_check_task_status_pending(client):
     response = client.get('/outbound?job_id=non_existent_id')
     assert response.status_code == 200
     data = json.loads(response.data)
-    assert data['status'] == 'Pending'
\ No newline at end of file
+    assert data['status'] == 'Pending'
+
+def test_receive_task_updates_last_api_call(client, app):
+    """Test that the /inbound endpoint records the call time in memory."""
+    app.config['LAST_API_CALL'] = 0.0
+    client.post('/inbound', data=json.dumps({'action': 'test_action'}), content_type='application/json')
+    assert app.config['LAST_API_CALL'] > 0.0
+
+def test_queues_status_does_not_update_last_api_call(client, app):
+    """Test that polling /queues does not count as activity for the idle check."""
+    app.config['LAST_API_CALL'] = 0.0
+    client.get('/queues')
+    assert app.config['LAST_API_CALL'] == 0.0
+
+def test_receive_task_writes_task_file(client, app):
+    """Test that the /inbound endpoint writes the task to the inbound queue as a single JSON file."""
+    response = client.post('/inbound', data=json.dumps({
+        'action': 'test_action',
+        'params': {'key': 'value'}
+    }), content_type='application/json')
+    job_id = json.loads(response.data)['job_id']
+
+    inbound_dir = app.config['INBOUND_DIR']
+    task_files = os.listdir(inbound_dir)
+    assert len(task_files) == 1
+    assert task_files[0].endswith(f"_{job_id}.json")
+
+    with open(os.path.join(inbound_dir, task_files[0]), 'rb') as f:
+        task = json.loads(f.read())
+    assert set(task) == {'job_id', 'action', 'params', 'status', 'received_at'}
+    assert task['job_id'] == job_id
+    assert task['action'] == 'test_action'
+    assert task['params'] == {'key': 'value'}
+    assert task['status'] == 'Pending'
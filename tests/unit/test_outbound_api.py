@@ -1,7 +1,7 @@
 #tests/unit/test_outbound_api.py
 import json
 import os
-import uuid
+from pathlib import Path
 
 def test_check_task_status_success(client, app):
     """
@@ -9,22 +9,20 @@ def test_check_task_status_success(client, app):
     This test requires manually creating a result file for the client to retrieve.
     """
     # 1. Setup: Create a fake result file in the outbound queue directory
-    job_id = str(uuid.uuid4())
+    job_id = "test-outbound-completed"
     expected_result = {
         'job_id': job_id,
         'status': 'Completed',
         'result': 'The process finished successfully.'
     }
 
-    # Use the app's config to get the correct, temporary test queue path
-    base_path = app.config['BASE_QUEUE_PATH']
-    outbound_dir = os.path.join(base_path, 'outbound')
-    consumed_dir = os.path.join(base_path, 'consumed')
+    # Use the app's config to get the correct, temporary test queue paths
+    outbound_dir = app.config['OUTBOUND_DIR']
+    consumed_dir = app.config['CONSUMED_DIR']
     result_filepath = os.path.join(outbound_dir, f"{job_id}.json")
 
     # The conftest fixture already creates the 'outbound' directory
-    with open(result_filepath, 'w') as f:
-        json.dump(expected_result, f)
+    Path(result_filepath).write_bytes(json.dumps(expected_result).encode())
 
     # 2. Action: Make a request to the outbound endpoint to fetch the result
     response = client.get(f'/outbound?job_id={job_id}')
@@ -68,4 +66,21 @@ def test_check_task_status_missing_job_id(client):
     assert response.status_code == 400
     data = json.loads(response.data)
     assert data['status'] == 'error'
-    assert 'Job ID is required' in data['message']
\ No newline at end of file
+    assert 'Job ID is required' in data['message']
+
+def test_check_task_status_failed(client, app):
+    """
+    Test the /outbound endpoint for a job whose failure marker is in the failed queue.
+    """
+    # 1. Setup: Create the marker left by the scheduler for a failed job
+    job_id = "test-outbound-failed"
+    failed_dir = app.config['FAILED_DIR']
+    open(os.path.join(failed_dir, f"{job_id}.marker"), 'wb').close()
+
+    # 2. Action: Poll the endpoint for this job ID
+    response = client.get(f'/outbound?job_id={job_id}')
+
+    # 3. Assertions: Verify the status is 'failed'
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['status'] == 'failed'
@@ -1,28 +1,31 @@
 import os
 import json
-from unittest.mock import patch, MagicMock
-from src.server import process_inbound_queue
+from pathlib import Path
+from unittest.mock import MagicMock
+import pytest
+import time
+from concurrent.futures.process import BrokenProcessPool
+from src.server import process_inbound_queue, check_idle_shutdown, flush_last_api_call, process_single_task
 
-def test_process_inbound_queue_malformed_json(app):
+def test_process_inbound_queue_malformed_json(app, monkeypatch):
     """
     Tests that the scheduler correctly handles a task file that is not valid JSON.
     """
     # 1. ARRANGE
-    base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(base_path, 'inbound')
-    failed_dir = os.path.join(base_path, 'failed')
+    inbound_dir = app.config['INBOUND_DIR']
+    failed_dir = app.config['FAILED_DIR']
     malformed_filename = "malformed_task.json"
     malformed_filepath = os.path.join(inbound_dir, malformed_filename)
 
-    with open(malformed_filepath, 'w') as f:
-        f.write("{'invalid_json': True,}")
+    Path(malformed_filepath).write_bytes(b"{'invalid_json': True,}")
 
     stop_event = MagicMock()
     stop_event.is_set.return_value = False
+    mock_write_result = MagicMock()
+    monkeypatch.setattr('src.server.write_result_to_outbound', mock_write_result)
 
     # 2. ACT
-    with patch('src.server.write_result_to_outbound') as mock_write_result:
-        process_inbound_queue(app, stop_event)
+    process_inbound_queue(app, stop_event)
 
     # 3. ASSERT
     assert not os.path.exists(malformed_filepath)
@@ -31,39 +34,130 @@ def test_process_inbound_queue_malformed_json(app):
     mock_write_result.assert_called_once()
     result_data = mock_write_result.call_args[0][1]
     assert result_data['status'] == 'failed'
-    # Check for a substring of the JSON error, which is more robust
-    assert 'Expecting property name' in result_data['error']
+    # Check for the position of the JSON error, which is stable across parsers
+    assert 'line 1 column 2' in result_data['error']
 
 
-def test_process_inbound_queue_unknown_action(app):
+def test_process_inbound_queue_unknown_action(app, monkeypatch):
     """
     Tests that the scheduler handles a task with an action that does not exist.
     """
     # 1. ARRANGE
-    base_path = app.config['BASE_QUEUE_PATH']
-    inbound_dir = os.path.join(base_path, 'inbound')
-    failed_dir = os.path.join(base_path, 'failed')
+    inbound_dir = app.config['INBOUND_DIR']
+    failed_dir = app.config['FAILED_DIR']
     job_id = "test-unknown-action"
     task_filename = f"12345_{job_id}.json"
     task_filepath = os.path.join(inbound_dir, task_filename)
 
     task_data = {'job_id': job_id, 'action': 'non_existent_action', 'params': {}}
-    with open(task_filepath, 'w') as f:
-        json.dump(task_data, f)
+    Path(task_filepath).write_bytes(json.dumps(task_data).encode())
 
     stop_event = MagicMock()
     stop_event.is_set.return_value = False
+    mock_write_result = MagicMock()
+    monkeypatch.setattr('src.server.write_result_to_outbound', mock_write_result)
 
     # 2. ACT
-    with patch('src.server.write_result_to_outbound') as mock_write_result:
-        process_inbound_queue(app, stop_event)
+    process_inbound_queue(app, stop_event)
 
     # 3. ASSERT
     assert not os.path.exists(task_filepath)
     assert os.path.exists(os.path.join(failed_dir, task_filename))
+    assert os.path.exists(os.path.join(failed_dir, f"{job_id}.marker"))
 
     mock_write_result.assert_called_once()
     result_data = mock_write_result.call_args[0][1]
     assert result_data['status'] == 'failed'
     # Check for the specific error message raised by the scheduler
-    assert "Action 'non_existent_action' not found" in result_data['error']
\ No newline at end of file
+    assert "Action 'non_existent_action' not found" in result_data['error']
+
+@pytest.mark.parametrize('action_name', ['..server', 'get_all_messages\n'])
+def test_process_inbound_queue_invalid_action_name(app, monkeypatch, action_name):
+    """
+    Tests that the scheduler rejects action names that are not plain module names.
+    """
+    # 1. ARRANGE
+    inbound_dir = app.config['INBOUND_DIR']
+    failed_dir = app.config['FAILED_DIR']
+    job_id = "test-invalid-action-name"
+    task_filename = f"12345_{job_id}.json"
+    task_filepath = os.path.join(inbound_dir, task_filename)
+
+    task_data = {'job_id': job_id, 'action': action_name, 'params': {}}
+    Path(task_filepath).write_bytes(json.dumps(task_data).encode())
+
+    stop_event = MagicMock()
+    stop_event.is_set.return_value = False
+    mock_write_result = MagicMock()
+    monkeypatch.setattr('src.server.write_result_to_outbound', mock_write_result)
+
+    # 2. ACT
+    process_inbound_queue(app, stop_event)
+
+    # 3. ASSERT
+    assert os.path.exists(os.path.join(failed_dir, task_filename))
+
+    mock_write_result.assert_called_once()
+    result_data = mock_write_result.call_args[0][1]
+    assert result_data['status'] == 'failed'
+    assert f"Invalid action name '{action_name}'" in result_data['error']
+
+
+def test_check_idle_shutdown_uses_latest_call_across_workers(app, monkeypatch):
+    """
+    Tests that a worker which has been idle itself does not power off the VM
+    while another worker has recorded a recent API call in the shared timestamp file.
+    """
+    # 1. ARRANGE
+    Path(app.config['TIMESTAMP_FILE']).write_text(str(time.time()))
+    app.config['LAST_API_CALL'] = 0.0
+
+    stop_event = MagicMock()
+    stop_event.is_set.return_value = False
+    scheduler = MagicMock()
+    mock_system = MagicMock()
+    monkeypatch.setattr('src.server.os.system', mock_system)
+
+    # 2. ACT
+    check_idle_shutdown(app, scheduler, stop_event)
+
+    # 3. ASSERT
+    mock_system.assert_not_called()
+    stop_event.set.assert_not_called()
+
+    # An idle worker's flush must not move the shared time backwards either.
+    flush_last_api_call(app)
+    assert float(Path(app.config['TIMESTAMP_FILE']).read_text()) > 0.0
+
+
+def test_process_single_task_broken_action_pool(app, monkeypatch):
+    """
+    Tests that a task the action pool can no longer run is failed instead of
+    being left in the processing queue, and that the broken pool is replaced.
+    """
+    # 1. ARRANGE
+    failed_dir = app.config['FAILED_DIR']
+    job_id = "test-broken-pool"
+    task_filename = f"12345_{job_id}.json"
+    task_data = {'job_id': job_id, 'action': 'get_all_messages', 'params': {}}
+    Path(app.config['INBOUND_DIR'], task_filename).write_bytes(json.dumps(task_data).encode())
+
+    broken_pool = MagicMock()
+    broken_pool.submit.side_effect = BrokenProcessPool("A worker process terminated abruptly.")
+    new_pool = MagicMock()
+    monkeypatch.setitem(app.config, 'ACTION_POOL', broken_pool)
+    monkeypatch.setitem(app.config, 'ACTION_POOL_WORKERS', 5)
+    monkeypatch.setattr('src.server._create_action_pool', lambda max_workers: new_pool)
+    mock_write_result = MagicMock()
+    monkeypatch.setattr('src.server.write_result_to_outbound', mock_write_result)
+
+    # 2. ACT
+    process_single_task(task_filename, app)
+
+    # 3. ASSERT
+    assert not os.listdir(app.config['PROCESSING_DIR'])
+    assert os.path.exists(os.path.join(failed_dir, task_filename))
+    assert os.path.exists(os.path.join(failed_dir, f"{job_id}.marker"))
+    assert mock_write_result.call_args[0][1]['status'] == 'failed'
+    assert app.config['ACTION_POOL'] is new_pool
+    broken_pool.shutdown.assert_called_once_with(wait=False)
@@ -1,26 +1,42 @@
 import pytest
 from unittest.mock import MagicMock, patch
-import tempfile
-import shutil
+from selenium.common.exceptions import TimeoutException
+from src.actions import search_espacenet
 from src.actions.search_espacenet import execute
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.common.by import By
+from tests.unit.conftest import make_element
+
+
+@pytest.fixture
+def wait_mock(monkeypatch):
+    """
+    Replaces the action's WebDriverWait with a fresh MagicMock for each test; tests only
+    set the sequence of elements returned by `.return_value.until`.
+    """
+    mock_wait = MagicMock()
+    monkeypatch.setattr(search_espacenet, 'WebDriverWait', mock_wait)
+    return mock_wait
 
 
 class TestSearchEspacenetUnit:
 
-    @patch('src.actions.search_espacenet.WebDriverWait')
-    @patch('time.sleep', return_value=None)
+    def create_patent_mock(self, title, patent_number, abstract):
+        """Helper to create a mock patent result element with a title, a patent number and an abstract."""
+        return make_element(children={
+            'span[class*="item__content--title"]': make_element(text=title),
+            'div[class*="item__content--subtitle"]': make_element(children={'span': make_element(text=patent_number)}),
+            'div[class*="item__content-abstract"]': make_element(text=abstract),
+        })
+
     @patch('src.actions.search_espacenet._setup_driver')
-    def test_execute_with_basic_query(self, mock_setup_driver, mock_sleep, mock_wait):
+    def test_execute_with_basic_query(self, mock_setup_driver, wait_mock, mock_driver, mock_write_result, tmp_path):
         """
         Tests the search_espacenet action with a basic query, mocking Selenium.
         """
-        mock_driver = MagicMock()
         mock_setup_driver.return_value = mock_driver
         mock_driver.get.return_value = None
         
-        temp_dir_for_mock = tempfile.mkdtemp()
+        (tmp_path / "profile").mkdir()
+        temp_dir_for_mock = str(tmp_path / "profile")
         mock_driver.temp_dir = temp_dir_for_mock
 
         # --- Mocks for driver-level elements ---
@@ -31,8 +47,7 @@ class TestSearchEspacenetUnit:
         mock_initial_load_element = MagicMock()
 
         # --- Mock WebDriverWait ---
-        mock_wait_instance = mock_wait.return_value
-        mock_wait_instance.until.side_effect = [
+        wait_mock.return_value.until.side_effect = [
             mock_initial_load_element,  # For initial page load
             mock_search_input,          # For finding search input before typing
             mock_search_button,
@@ -40,41 +55,8 @@ class TestSearchEspacenetUnit:
             mock_scrollable_div,
         ]
 
-        # --- Mock for Patent 1 ---
-        mock_patent1 = MagicMock()
-        mock_title1 = MagicMock(text="Test Patent 1")
-        mock_subtitle1_container = MagicMock()
-        mock_subtitle1_span = MagicMock(text="PN123")
-        mock_subtitle1_container.find_element.return_value = mock_subtitle1_span
-        mock_abstract1 = MagicMock(text="This is a snippet for the first test patent.")
-
-        def patent1_find_element(by, selector):
-            if selector == 'span[class*="item__content--title"]':
-                return mock_title1
-            if selector == 'div[class*="item__content--subtitle"]':
-                return mock_subtitle1_container
-            if selector == 'div[class*="item__content-abstract"]':
-                return mock_abstract1
-            return MagicMock(text=None)
-        mock_patent1.find_element.side_effect = patent1_find_element
-
-        # --- Mock for Patent 2 ---
-        mock_patent2 = MagicMock()
-        mock_title2 = MagicMock(text="Test Patent 2")
-        mock_subtitle2_container = MagicMock()
-        mock_subtitle2_span = MagicMock(text="PN456")
-        mock_subtitle2_container.find_element.return_value = mock_subtitle2_span
-        mock_abstract2 = MagicMock(text="This is a snippet for the second test patent.")
-
-        def patent2_find_element(by, selector):
-            if selector == 'span[class*="item__content--title"]':
-                return mock_title2
-            if selector == 'div[class*="item__content--subtitle"]':
-                return mock_subtitle2_container
-            if selector == 'div[class*="item__content-abstract"]':
-                return mock_abstract2
-            return MagicMock(text=None)
-        mock_patent2.find_element.side_effect = patent2_find_element
+        mock_patent1 = self.create_patent_mock("Test Patent 1", "PN123", "This is a snippet for the first test patent.")
+        mock_patent2 = self.create_patent_mock("Test Patent 2", "PN456", "This is a snippet for the second test patent.")
 
         # Configure mock_driver.find_elements to return patents on the first call, then empty
         mock_driver.find_elements.side_effect = [
@@ -84,42 +66,32 @@ class TestSearchEspacenetUnit:
 
         job_id = "test-espacenet-job-123"
         params = {"queries": [["keyword1", "keyword2"]]}
-        temp_download_dir = tempfile.mkdtemp()
-        mock_write_result = MagicMock()
+        temp_download_dir = str(tmp_path)
 
-        try:
-            execute(job_id, params, temp_download_dir, mock_write_result)
+        execute(job_id, params, temp_download_dir, mock_write_result)
 
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
 
-            assert result['status'] == 'Completed'
-            assert len(result['result']['patents']) == 2
+        assert result['status'] == 'Completed'
+        assert len(result['result']['patents']) == 2
 
-            patents = sorted(result['result']['patents'], key=lambda p: p['patent_number'])
-            assert patents[0]['title'] == "Test Patent 1"
-            assert patents[0]['patent_number'] == "PN123"
-            assert patents[0]['keyword_matches'] == 2
-            assert patents[1]['title'] == "Test Patent 2"
-            assert patents[1]['patent_number'] == "PN456"
+        patents_by_number = {patent['patent_number']: patent for patent in result['result']['patents']}
+        assert patents_by_number.keys() == {"PN123", "PN456"}
+        assert patents_by_number["PN123"]['title'] == "Test Patent 1"
+        assert patents_by_number["PN123"]['keyword_matches'] == 2
+        assert patents_by_number["PN456"]['title'] == "Test Patent 2"
 
-        finally:
-            shutil.rmtree(temp_download_dir)
-
-    @patch('src.actions.search_espacenet.WebDriverWait')
-    @patch('time.sleep', return_value=None)
     @patch('src.actions.search_espacenet._setup_driver')
-    def test_execute_no_results(self, mock_setup_driver, mock_sleep, mock_wait):
+    def test_execute_no_results(self, mock_setup_driver, wait_mock, mock_driver, mock_write_result, tmp_path):
         """Tests the action when no results are found."""
-        mock_driver = MagicMock()
         mock_setup_driver.return_value = mock_driver
         mock_driver.get.return_value = None
         mock_driver.find_elements.return_value = []
 
         job_id = "test-job-no-results"
         params = {"queries": [["nonexistent query"]]}
-        temp_download_dir = tempfile.mkdtemp()
-        mock_write_result = MagicMock()
+        temp_download_dir = str(tmp_path)
 
         # --- Mocks for driver-level elements ---
         mock_search_input = MagicMock()
@@ -127,22 +99,38 @@ class TestSearchEspacenetUnit:
         mock_initial_load_element = MagicMock()
 
         # --- Mock WebDriverWait ---
-        mock_wait_instance = mock_wait.return_value
-        mock_wait_instance.until.side_effect = [
+        wait_mock.return_value.until.side_effect = [
             mock_initial_load_element,  # For initial page load
             mock_search_input,          # For finding search input before typing
             mock_search_button,
             TimeoutException("No results found")
         ]
 
-        try:
-            execute(job_id, params, temp_download_dir, mock_write_result)
+        execute(job_id, params, temp_download_dir, mock_write_result)
+
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
+
+        assert result['status'] == 'Completed'
+        assert len(result['result']['patents']) == 0
+        assert result['result']['total_patents_scraped'] == 0
+
+    @patch('src.actions.search_espacenet._setup_driver')
+    def test_execute_reuses_given_driver(self, mock_setup_driver, wait_mock, mock_driver, mock_write_result, tmp_path):
+        """Tests that a driver passed in is used instead of a new one and is left open."""
+        mock_driver.find_elements.return_value = []
+        wait_mock.return_value.until.side_effect = [
+            MagicMock(),  # For initial page load
+            MagicMock(),  # For finding search input before typing
+            MagicMock(),  # Search button
+            TimeoutException("No results found")
+        ]
+        temp_download_dir = str(tmp_path)
 
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
+        execute("test-job-reuse", {"queries": [["query"]]}, temp_download_dir, mock_write_result, driver=mock_driver)
 
-            assert result['status'] == 'Completed'
-            assert len(result['result']['patents']) == 0
-            assert result['result']['total_patents_scraped'] == 0
-        finally:
-            shutil.rmtree(temp_download_dir)
+        mock_setup_driver.assert_not_called()
+        mock_driver.get.assert_called_once()
+        mock_driver.quit.assert_not_called()
+        _, result = mock_write_result.call_args[0]
+        assert result['status'] == 'Completed'
@@ -1,34 +1,53 @@
 import pytest
-from unittest.mock import MagicMock, patch
-import tempfile
-import shutil
+from unittest.mock import MagicMock
+from src.actions import search_uspto
 from src.actions.search_uspto import execute
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+from tests.unit.conftest import make_element
+
+
+@pytest.fixture
+def uspto_mocks(patch_module, mock_driver):
+    """
+    Hands the test's `mock_driver` to search_uspto and mocks its WebDriverWait and
+    ActionChains, so each test scripts the elements the PPUBS search page yields.
+    """
+    mocks = patch_module(search_uspto, '_setup_driver', 'WebDriverWait', 'ActionChains')
+    mocks.driver = mock_driver
+    mocks.setup_driver.return_value = mock_driver
+    return mocks
 
 
 class TestSearchUsptoUnit:
 
-    @patch('src.actions.search_uspto.ActionChains')
-    @patch('src.actions.search_uspto.WebDriverWait')
-    @patch('src.actions.search_uspto._setup_driver')
-    def test_execute_with_basic_query(self, mock_setup_driver, mock_wait, mock_action_chains):
+    def create_patent_mock(self, patent_number, title):
+        """Helper to create a mock result grid row with a patent number and a title."""
+        return make_element(children={
+            'input.row-select-check': make_element(attrs={'data-docid': patent_number}),
+            'div[aria-describedby$="inventionTitle"] span': make_element(text=title, attrs={'title': title}),
+        })
+
+    def test_execute_with_basic_query(self, uspto_mocks, mock_write_result, tmp_path):
         """
         Tests the search_uspto action with a basic query, mocking Selenium.
         """
-        mock_driver = MagicMock()
-        mock_setup_driver.return_value = mock_driver
+        mock_driver = uspto_mocks.driver
         mock_driver.get.return_value = None
 
         # --- Mock Patent Detail Page Elements ---
-        mock_details_container = MagicMock()
-        mock_detail_element = MagicMock()
-        mock_detail_element.text = "Mocked Detail Text"
-        mock_details_container.find_element.return_value = mock_detail_element
-        mock_details_container.find_elements.return_value = [mock_detail_element]
+        # Elements that are only read are built with make_element; the ones the action clicks
+        # or types into are mocks limited to the WebElement API.
+        mock_detail_element = make_element(text="Mocked Detail Text")
+        mock_details_container = make_element(children={
+            'div.meta-inventorsInfoGroup .meta-col:nth-child(1) > div': mock_detail_element,
+            'div.meta-applicantInfoGroup .clearfix .item:nth-child(1) .meta-col': mock_detail_element,
+            'div.meta-assigneeInfoGroup .clearfix .item:nth-child(1) .meta-col div': mock_detail_element,
+        })
 
         # --- Mock driver's find_element and find_elements ---
-        mock_total_patents_element = MagicMock(text="2")
-        mock_scrollable_element = MagicMock()
+        mock_total_patents_element = make_element(text="2")
+        mock_scrollable_element = MagicMock(spec=WebElement)
 
         def driver_find_element_side_effect(by, selector):
             if selector == ".resultNumber":
@@ -37,16 +56,14 @@ class TestSearchUsptoUnit:
                 return mock_scrollable_element
             if selector == "div.docMetadata":
                 return mock_details_container
-            return MagicMock()
+            return MagicMock(spec=WebElement)
 
         mock_driver.find_element.side_effect = driver_find_element_side_effect
 
         # --- Mock WebDriverWait and ActionChains ---
-        mock_wait_instance = mock_wait.return_value
-        mock_search_input = MagicMock()
-        mock_abstract_container = MagicMock()
-        mock_abstract_paragraph = MagicMock(text="This is the abstract.")
-        mock_abstract_container.find_elements.return_value = [mock_abstract_paragraph]
+        mock_wait_instance = uspto_mocks.WebDriverWait.return_value
+        mock_search_input = MagicMock(spec=WebElement)
+        mock_abstract_container = make_element(children={'p': make_element(text="This is the abstract.")})
 
         mock_wait_instance.until.side_effect = [
             # --- Main search ---
@@ -71,29 +88,12 @@ class TestSearchUsptoUnit:
             TimeoutException(),      # 15. Close pop-up (times out)
             mock_abstract_container, # 16. Abstract container for patent 2
         ]
-        mock_actions_instance = mock_action_chains.return_value
+        mock_actions_instance = uspto_mocks.ActionChains.return_value
         mock_actions_instance.click.return_value = mock_actions_instance
 
         # --- Mock Patent Elements ---
-        def create_patent_mock(patent_number, title):
-            mock_patent = MagicMock()
-            mock_checkbox = MagicMock()
-            mock_checkbox.get_attribute.return_value = patent_number
-            mock_title = MagicMock()
-            mock_title.get_attribute.return_value = title
-            mock_title.text = title
-
-            def find_element_side_effect(by, selector):
-                if selector == 'input.row-select-check':
-                    return mock_checkbox
-                if 'inventionTitle' in selector:
-                    return mock_title
-                return MagicMock(text="some data")
-            mock_patent.find_element.side_effect = find_element_side_effect
-            return mock_patent
-
-        mock_patent1 = create_patent_mock("PN123", "Test Patent 1")
-        mock_patent2 = create_patent_mock("PN456", "Test Patent 2")
+        mock_patent1 = self.create_patent_mock("PN123", "Test Patent 1")
+        mock_patent2 = self.create_patent_mock("PN456", "Test Patent 2")
 
         # Simulate scrolling: first find returns patents, second returns same to stop loop
         mock_driver.find_elements.side_effect = [
@@ -104,47 +104,38 @@ class TestSearchUsptoUnit:
         # --- Execute Test ---
         job_id = "test-uspto-job-123"
         params = {"queries": [["keyword1", "keyword2"]]}
-        temp_download_dir = tempfile.mkdtemp()
-        mock_write_result = MagicMock()
-
-        try:
-            execute(job_id, params, temp_download_dir, mock_write_result)
-
-            # --- Assertions ---
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
-
-            assert result['status'] == 'Completed'
-            assert len(result['result']['patents']) == 2
-
-            patents = sorted(result['result']['patents'], key=lambda p: p['patent_number'])
-            
-            assert patents[0]['title'] == "Test Patent 1"
-            assert patents[0]['patent_number'] == "PN123"
-            assert patents[0]['keyword_matches'] == 2
-            assert patents[0]['abstract'] == "This is the abstract."
-            assert patents[0]['inventor'] == "Mocked Detail Text" # Check updated data
-
-            assert patents[1]['title'] == "Test Patent 2"
-            assert patents[1]['patent_number'] == "PN456"
-            assert patents[1]['keyword_matches'] == 2
-            assert patents[1]['abstract'] == "This is the abstract."
-            assert patents[1]['inventor'] == "Mocked Detail Text" # Check updated data
-
-        finally:
-            shutil.rmtree(temp_download_dir)
-
-    @patch('src.actions.search_uspto.ActionChains')
-    @patch('src.actions.search_uspto.WebDriverWait')
-    @patch('src.actions.search_uspto._setup_driver')
-    def test_execute_no_results(self, mock_setup_driver, mock_wait, mock_action_chains):
+        temp_download_dir = str(tmp_path)
+
+        execute(job_id, params, temp_download_dir, mock_write_result)
+
+        # --- Assertions ---
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
+
+        assert result['status'] == 'Completed'
+        assert len(result['result']['patents']) == 2
+
+        patents = sorted(result['result']['patents'], key=lambda p: p['patent_number'])
+        
+        assert patents[0]['title'] == "Test Patent 1"
+        assert patents[0]['patent_number'] == "PN123"
+        assert patents[0]['keyword_matches'] == 2
+        assert patents[0]['abstract'] == "This is the abstract."
+        assert patents[0]['inventor'] == "Mocked Detail Text" # Check updated data
+
+        assert patents[1]['title'] == "Test Patent 2"
+        assert patents[1]['patent_number'] == "PN456"
+        assert patents[1]['keyword_matches'] == 2
+        assert patents[1]['abstract'] == "This is the abstract."
+        assert patents[1]['inventor'] == "Mocked Detail Text" # Check updated data
+
+    def test_execute_no_results(self, uspto_mocks, mock_write_result, tmp_path):
         """Tests the action when no results are found."""
-        mock_driver = MagicMock()
-        mock_setup_driver.return_value = mock_driver
+        mock_driver = uspto_mocks.driver
         mock_driver.get.return_value = None
 
         # Make the wait for search results time out
-        mock_wait_instance = mock_wait.return_value
+        mock_wait_instance = uspto_mocks.WebDriverWait.return_value
         mock_wait_instance.until.side_effect = [
             MagicMock(),  # Cookie disclaimer
             MagicMock(),  # Close pop-up
@@ -152,21 +143,17 @@ class TestSearchUsptoUnit:
             MagicMock(),  # Search button
             TimeoutException("No results found"),  # Wait for results times out
         ]
-        mock_action_chains.return_value.click.return_value.perform.return_value = None
+        uspto_mocks.ActionChains.return_value.click.return_value.perform.return_value = None
 
         job_id = "test-job-no-results"
         params = {"queries": [["nonexistent query"]]}
-        temp_download_dir = tempfile.mkdtemp()
-        mock_write_result = MagicMock()
+        temp_download_dir = str(tmp_path)
 
-        try:
-            execute(job_id, params, temp_download_dir, mock_write_result)
+        execute(job_id, params, temp_download_dir, mock_write_result)
 
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
 
-            assert result['status'] == 'Completed'
-            assert len(result['result']['patents']) == 0
-            assert result['result']['total_patents_scraped'] == 0
-        finally:
-            shutil.rmtree(temp_download_dir)
+        assert result['status'] == 'Completed'
+        assert len(result['result']['patents']) == 0
+        assert result['result']['total_patents_scraped'] == 0
@@ -1,39 +1,24 @@
 import pytest
 from unittest.mock import MagicMock, patch
-import tempfile
-import shutil
 from src.actions.search_wipo import execute
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
+from tests.unit.conftest import make_element
 
 
 class TestSearchWipoUnit:
 
-    def create_text_mock(self, text_value):
-        """
-        Helper to create a mock with a .text attribute that holds a string.
-        
-        IMPORTANT: MagicMock(text="foo") does NOT work as expected. It creates a mock
-        with the *name* 'text', but mock.text returns another MagicMock, leading
-        to JSON serialization errors. The correct way is to assign the attribute
-        after creation.
-        """
-        mock = MagicMock()
-        mock.text = text_value
-        return mock
-
     @patch('src.actions.search_wipo.WebDriverWait')
     @patch('src.actions.search_wipo._setup_driver')
-    def test_execute_with_basic_query(self, mock_setup_driver, mock_wait):
+    def test_execute_with_basic_query(self, mock_setup_driver, mock_wait, mock_driver, mock_write_result, tmp_path):
         """
         Tests the search_wipo action with a basic query, mocking Selenium.
         """
-        mock_driver = MagicMock()
         mock_setup_driver.return_value = mock_driver
         mock_driver.get.return_value = None
 
         # --- Mock driver's find_element and find_elements ---
-        mock_total_patents_element = self.create_text_mock("2 results")
+        mock_total_patents_element = make_element(text="2 results")
 
         def driver_find_element_side_effect(by, selector):
             if by == By.ID and selector == "psCaptchaForm":
@@ -42,16 +27,16 @@ class TestSearchWipoUnit:
                 if selector == "span.results-count":
                     return mock_total_patents_element
                 if selector == "div.patent-abstract":
-                    return self.create_text_mock("This is the abstract.")
+                    return make_element(text="This is the abstract.")
             elif by == By.XPATH:
                 if "Application Date" in selector or "Filing Date" in selector:
-                    return self.create_text_mock("2023-01-01")
+                    return make_element(text="2023-01-01")
                 if "Application Number" in selector or "Publication Number" in selector:
-                    return self.create_text_mock("APP123")
+                    return make_element(text="APP123")
                 if "Inventors" in selector:
-                    return self.create_text_mock("Test Inventor")
+                    return make_element(text="Test Inventor")
                 if "Applicants" in selector:
-                    return self.create_text_mock("Test Applicant")
+                    return make_element(text="Test Applicant")
                 raise NoSuchElementException
             raise NoSuchElementException(f"Unhandled driver.find_element call: by={by}, selector='{selector}'")
 
@@ -82,13 +67,13 @@ class TestSearchWipoUnit:
             def find_element_side_effect(by, selector):
                 if by == By.CSS_SELECTOR:
                     if selector == 'span.ps-patent-result--title--title':
-                        return self.create_text_mock(title)
+                        return make_element(text=title)
                     if selector == 'div.ps-patent-result--title--ctr-pubdate':
-                        return self.create_text_mock("US - 15.02.2023")
+                        return make_element(text="US - 15.02.2023")
                     if selector == 'span.ps-patent-result--inventor':
-                        return self.create_text_mock("Initial Inventor")
+                        return make_element(text="Initial Inventor")
                     if selector == 'span.ps-patent-result--applicant':
-                        return self.create_text_mock("Initial Applicant")
+                        return make_element(text="Initial Applicant")
                 raise NoSuchElementException(f"Unhandled mock_patent.find_element: by={by}, sel='{selector}'")
             mock_patent.find_element.side_effect = find_element_side_effect
             return mock_patent
@@ -104,44 +89,38 @@ class TestSearchWipoUnit:
         # --- Execute Test ---
         job_id = "test-wipo-job-123"
         params = {"queries": [["keyword1", "keyword2"]], "max_number_of_patents": 10}
-        temp_download_dir = tempfile.mkdtemp()
-        mock_write_result = MagicMock()
-
-        try:
-            execute(job_id, params, temp_download_dir, mock_write_result)
+        temp_download_dir = str(tmp_path)
 
-            # --- Assertions ---
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
+        execute(job_id, params, temp_download_dir, mock_write_result)
 
-            assert result['status'] == 'Completed'
-            assert len(result['result']['patents']) == 2
+        # --- Assertions ---
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
 
-            patents = sorted(result['result']['patents'], key=lambda p: p['patent_number'])
+        assert result['status'] == 'Completed'
+        assert len(result['result']['patents']) == 2
 
-            assert patents[0]['title'] == "Test Patent 1"
-            assert patents[0]['patent_number'] == "WO2023000001"
-            assert patents[0]['abstract'] == "This is the abstract."
-            assert patents[0]['filing_date'] == "2023-01-01"
-            assert patents[0]['application_number'] == "APP123"
-            # The detail page mock for 'Publication Date' raises an exception,
-            # so the value from the results page should be preserved.
-            assert patents[0]['date_published'] == "15.02.2023"
-            assert patents[0]['inventor'] == "Test Inventor"
-            assert patents[0]['assignee'] == "Test Applicant"
+        patents = sorted(result['result']['patents'], key=lambda p: p['patent_number'])
 
-        finally:
-            shutil.rmtree(temp_download_dir)
+        assert patents[0]['title'] == "Test Patent 1"
+        assert patents[0]['patent_number'] == "WO2023000001"
+        assert patents[0]['abstract'] == "This is the abstract."
+        assert patents[0]['filing_date'] == "2023-01-01"
+        assert patents[0]['application_number'] == "APP123"
+        # The detail page mock for 'Publication Date' raises an exception,
+        # so the value from the results page should be preserved.
+        assert patents[0]['date_published'] == "15.02.2023"
+        assert patents[0]['inventor'] == "Test Inventor"
+        assert patents[0]['assignee'] == "Test Applicant"
 
     @patch('src.actions.search_wipo.WebDriverWait')
     @patch('src.actions.search_wipo._setup_driver')
-    def test_execute_no_results(self, mock_setup_driver, mock_wait):
+    def test_execute_no_results(self, mock_setup_driver, mock_wait, mock_driver, mock_write_result, tmp_path):
         """Tests the action when no results are found."""
-        mock_driver = MagicMock()
         mock_setup_driver.return_value = mock_driver
         mock_driver.get.return_value = None
 
-        mock_total_patents_element = self.create_text_mock("0 results")
+        mock_total_patents_element = make_element(text="0 results")
 
         def find_element_side_effect(by, selector):
             if by == By.ID and selector == "psCaptchaForm":
@@ -164,17 +143,13 @@ class TestSearchWipoUnit:
 
         job_id = "test-job-no-results"
         params = {"queries": [["nonexistent query"]]}
-        temp_download_dir = tempfile.mkdtemp()
-        mock_write_result = MagicMock()
+        temp_download_dir = str(tmp_path)
 
-        try:
-            execute(job_id, params, temp_download_dir, mock_write_result)
+        execute(job_id, params, temp_download_dir, mock_write_result)
 
-            mock_write_result.assert_called_once()
-            _, result = mock_write_result.call_args[0]
+        mock_write_result.assert_called_once()
+        _, result = mock_write_result.call_args[0]
 
-            assert result['status'] == 'Completed'
-            assert len(result['result']['patents']) == 0
-            assert result['result']['total_patents_scraped'] == 0
-        finally:
-            shutil.rmtree(temp_download_dir)
\ No newline at end of file
+        assert result['status'] == 'Completed'
+        assert len(result['result']['patents']) == 0
+        assert result['result']['total_patents_scraped'] == 0
\ No newline at end of file